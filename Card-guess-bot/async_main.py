@@ -0,0 +1,54 @@
+import asyncio
+
+from telebot import asyncio_helper
+from telebot.async_telebot import AsyncTeleBot
+
+import game
+from dispatcher import ChatDispatcher
+from outbox import Outbox
+from sessions import SessionStore
+
+# new token should be generated and added by user when the bot is created
+TOKEN = ""
+# Sessions survive restarts in this database
+SESSIONS_DB = "sessions.db"
+
+# All requests go through one pooled aiohttp session, this is the pool size
+asyncio_helper.REQUEST_LIMIT = 100
+
+
+# Handler that plays the game of a chat and queues the replies
+def create_handler(bot, store, **limits):
+  async def send(chat_id, text, keyboard):
+    await bot.send_message(chat_id, text, reply_markup=keyboard)
+
+  outbox = Outbox(send, **limits)
+
+  async def handle(chat_id, text):
+    session = store.load(chat_id)
+    replies = game.handle(session, text)
+    if not replies:
+      return
+    store.put(session)
+    outbox.submit(chat_id, replies)
+
+  return handle, outbox
+
+
+def create_bot(token, store=None, **limits):
+  bot = AsyncTeleBot(token)
+  handle, outbox = create_handler(bot, store or SessionStore(), **limits)
+  dispatcher = ChatDispatcher(handle)
+
+  # Only hand the message over, so polling never waits for a slow chat
+  @bot.message_handler(content_types=["text"])
+  async def on_message(message):
+    dispatcher.submit(message.chat.id, message.text)
+
+  bot.dispatcher = dispatcher
+  bot.outbox = outbox
+  return bot
+
+
+if __name__ == "__main__":
+  asyncio.run(create_bot(TOKEN, SessionStore(SESSIONS_DB)).infinity_polling())
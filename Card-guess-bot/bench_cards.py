@@ -0,0 +1,77 @@
+"""Rounds per second of the card engine against the old random_card() path.
+
+  python bench_cards.py --rounds 1000000
+"""
+import argparse
+import random
+import time
+
+import cards
+
+OLD_NUMBERS = ["2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "A"]
+
+
+# The way the bot drew and checked cards before the card engine
+def random_card():
+  value = random.choice(
+      ["2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "A"])
+  suit = random.choice(["Hearts", "Diamonds", "Clubs", "Spades"])
+  return [value, suit]
+
+
+def old_round(text):
+  random_card_number, random_card_suit = random_card()
+  if text not in ["🟥", "⬛️"]:
+    return None
+  if text == "🟥" and random_card_suit in ["Hearts", "Diamonds"]:
+    return True
+  return text == "⬛️" and random_card_suit in ["Spades", "Clubs"]
+
+
+def old_number_round(text):
+  random_card_number, random_card_suit = random_card()
+  if text not in OLD_NUMBERS:
+    return None
+  return text == random_card_number
+
+
+def run(rounds):
+  answers = ["🟥", "⬛️"] * (rounds // 2)
+  numbers = [OLD_NUMBERS[i % 13] for i in range(rounds)]
+  deck = cards.CardDeck(seed=1)
+  stats = cards.Stats()
+  check = cards.check
+  results = {}
+
+  start = time.perf_counter()
+  for text in answers:
+    old_round(text)
+  for text in numbers:
+    old_number_round(text)
+  results["random_card"] = 2 * rounds / (time.perf_counter() - start)
+
+  start = time.perf_counter()
+  for text in answers:
+    check("color", text, deck.draw())
+  for text in numbers:
+    check("number", text, deck.draw())
+  results["card_engine"] = 2 * rounds / (time.perf_counter() - start)
+
+  start = time.perf_counter()
+  for text in answers:
+    stats.record("color", check("color", text, deck.draw()))
+  results["card_engine_with_stats"] = rounds / (time.perf_counter() - start)
+
+  start = time.perf_counter()
+  for _ in range(1000):
+    stats.win_rate()
+  results["stats_queries"] = 1000 / (time.perf_counter() - start)
+  return results
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser()
+  parser.add_argument("--rounds", type=int, default=1_000_000)
+  args = parser.parse_args()
+  for name, per_second in run(args.rounds).items():
+    print(f"{name:>24}: {per_second:,.0f}/s")
@@ -0,0 +1,99 @@
+"""Offline benchmark of the bot against the local fake Bot API.
+
+  python benchmark.py --chats 100 --rounds 3 --mode sync async
+  python benchmark.py --chats 2000 --send-delay 0 --no-rate-limits \
+      --mode sharded --workers 1 2 4 8
+"""
+import argparse
+import asyncio
+import json
+import threading
+
+import telebot
+from telebot import apihelper, asyncio_helper
+
+import async_main
+import main
+from fake_server import FakeBotApi, serve
+from supervisor import Supervisor
+
+TOKEN = "123:fake"
+# Rates high enough to never slow the bot down
+NO_LIMITS = {"global_rate": 1e9, "per_chat_rate": 1e9}
+
+
+def api_url(port):
+  return f"http://127.0.0.1:{port}/bot{{0}}/{{1}}"
+
+
+async def run_async(api, port, limits, _workers):
+  asyncio_helper.API_URL = api_url(port)
+  bot = async_main.create_bot(TOKEN, **limits)
+  polling = asyncio.create_task(bot.infinity_polling(timeout=1))
+  api.start()
+  await api.finished.wait()
+  polling.cancel()
+  await asyncio.gather(polling, return_exceptions=True)
+  await asyncio_helper.session_manager.session.close()
+  asyncio_helper.session_manager.session = None
+
+
+async def run_sync(api, port, limits, _workers):
+  apihelper.API_URL = api_url(port)
+  bot = main.create_bot(TOKEN, **limits)
+  thread = threading.Thread(target=bot.infinity_polling, kwargs={"timeout": 1},
+                            daemon=True)
+  thread.start()
+  api.start()
+  await api.finished.wait()
+  bot.stop_polling()
+
+
+async def run_sharded(api, port, limits, workers):
+  supervisor = Supervisor(TOKEN, workers, sessions_db=None, api_url=api_url(port),
+                          poll_timeout=1, **limits)
+  thread = threading.Thread(target=supervisor.run, daemon=True)
+  thread.start()
+  # Let the workers start before the clock runs
+  while len(supervisor.workers) < workers:
+    await asyncio.sleep(0.1)
+  await asyncio.sleep(1)
+  api.start()
+  await api.finished.wait()
+  supervisor.stop()
+  await asyncio.get_running_loop().run_in_executor(None, thread.join)
+
+
+RUNNERS = {"sync": run_sync, "async": run_async, "sharded": run_sharded}
+
+
+async def benchmark(mode, chats, rounds, send_delay, rate_limits=True, workers=1):
+  api = FakeBotApi(chats, rounds, send_delay, rate_limits=rate_limits)
+  runner, port = await serve(api)
+  try:
+    await RUNNERS[mode](api, port, {} if rate_limits else NO_LIMITS, workers)
+  finally:
+    await runner.cleanup()
+  result = {"mode": mode, **api.report()}
+  if mode == "sharded":
+    result["workers"] = workers
+  return result
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser()
+  parser.add_argument("--chats", type=int, default=100)
+  parser.add_argument("--rounds", type=int, default=3)
+  parser.add_argument("--send-delay", type=float, default=0.05)
+  parser.add_argument("--no-rate-limits", action="store_true")
+  parser.add_argument("--mode", nargs="+", choices=list(RUNNERS),
+                      default=["sync", "async"])
+  parser.add_argument("--workers", type=int, nargs="+", default=[4])
+  args = parser.parse_args()
+
+  telebot.logger.setLevel("ERROR")
+  for mode in args.mode:
+    for workers in args.workers if mode == "sharded" else [1]:
+      result = asyncio.run(benchmark(mode, args.chats, args.rounds, args.send_delay,
+                                     not args.no_rate_limits, workers))
+      print(json.dumps(result))
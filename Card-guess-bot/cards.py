@@ -0,0 +1,75 @@
+import numpy as np
+
+CARD_NUMBERS = ["2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "A"]
+CARD_SUITS = ["Hearts", "Diamonds", "Clubs", "Spades"]
+COLORS = ["🟥", "⬛️"]
+SUIT_COLORS = [0, 0, 1, 1]
+
+# A card is a small int: suit * 13 + number
+CARDS = len(CARD_SUITS) * len(CARD_NUMBERS)
+CARD_NAMES = [f"{number} {suit}" for suit in CARD_SUITS for number in CARD_NUMBERS]
+
+# What the player guesses about a card, indexed by the card
+CARD_NUMBER = [card % len(CARD_NUMBERS) for card in range(CARDS)]
+CARD_SUIT = [card // len(CARD_NUMBERS) for card in range(CARDS)]
+CARD_COLOR = [SUIT_COLORS[suit] for suit in CARD_SUIT]
+
+# Level name: (answer text -> code, card -> code)
+GUESSES = {
+    "color": ({color: code for code, color in enumerate(COLORS)}, CARD_COLOR),
+    "suit": ({suit: code for code, suit in enumerate(CARD_SUITS)}, CARD_SUIT),
+    "number": ({number: code for code, number in enumerate(CARD_NUMBERS)}, CARD_NUMBER),
+}
+LEVELS = list(GUESSES)
+LEVEL_INDEX = {level: index for index, level in enumerate(LEVELS)}
+
+
+class CardDeck:
+  """Random cards drawn from a seeded generator in batches."""
+
+  def __init__(self, seed=None, batch_size=4096):
+    self.rng = np.random.default_rng(seed)
+    self.batch_size = batch_size
+    self._cards = []
+    self._position = 0
+
+  def draw(self):
+    if self._position == len(self._cards):
+      # A plain list is much faster to index one by one than an array
+      cards = self.rng.integers(0, CARDS, self.batch_size, dtype=np.uint8)
+      self._cards = cards.tolist()
+      self._position = 0
+    card = self._cards[self._position]
+    self._position += 1
+    return card
+
+
+# Whether the answer guesses the card right, None when the answer is not valid
+def check(level, text, card):
+  answers, card_codes = GUESSES[level]
+  code = answers.get(text)
+  if code is None:
+    return None
+  return code == card_codes[card]
+
+
+class Stats:
+  """Rounds and wins of every level over all chats, for the /stats answer.
+
+  Each chat keeps its own score in its Session, so these are only the totals
+  and stay the same size however many chats play. They count from the start
+  of the process.
+  """
+
+  def __init__(self):
+    self.wins = [0] * len(LEVELS)
+    self.rounds = [0] * len(LEVELS)
+
+  def record(self, level, won):
+    level = LEVEL_INDEX[level]
+    self.rounds[level] += 1
+    if won:
+      self.wins[level] += 1
+
+  def win_rate(self):
+    return sum(self.wins) / max(sum(self.rounds), 1)
@@ -0,0 +1,51 @@
+import asyncio
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class ChatDispatcher:
+  """Runs the handler concurrently for different chats.
+
+  Updates of one chat are handled strictly one after another, so the game
+  steps of a chat never interleave. A chat only holds a queue and a task while
+  it has updates waiting, idle chats cost nothing.
+  """
+
+  def __init__(self, handler, max_concurrency=512):
+    self.handler = handler
+    self._queues = {}
+    self._tasks = set()
+    self._limit = asyncio.Semaphore(max_concurrency)
+
+  def submit(self, chat_id, update):
+    queue = self._queues.get(chat_id)
+    if queue is not None:
+      queue.append(update)
+      return
+    self._queues[chat_id] = deque([update])
+    task = asyncio.create_task(self._drain(chat_id))
+    self._tasks.add(task)
+    task.add_done_callback(self._tasks.discard)
+
+  async def _drain(self, chat_id):
+    queue = self._queues[chat_id]
+    try:
+      async with self._limit:
+        while queue:
+          update = queue.popleft()
+          try:
+            await self.handler(chat_id, update)
+          except Exception:
+            logger.exception("Handler failed for chat %s", chat_id)
+    finally:
+      del self._queues[chat_id]
+
+  @property
+  def active_chats(self):
+    return len(self._queues)
+
+  async def join(self):
+    while self._tasks:
+      await asyncio.gather(*list(self._tasks))
@@ -0,0 +1,181 @@
+import asyncio
+import json
+import time
+from urllib.parse import parse_qsl
+
+from aiohttp import web
+
+import outbox
+
+
+class FakeBotApi:
+  """Local stand-in for the Telegram Bot API, used for offline benchmarks.
+
+  Every simulated chat plays a scripted game: it sends the next line of the
+  script as soon as the bot has answered the previous one. The bot has answered
+  when a message with reply markup arrives, because every game step ends with
+  a keyboard. The time from sending a line to that answer is the reply latency.
+  Messages over the Telegram rate limits are refused with 429, like the real
+  API does.
+  """
+
+  def __init__(self, chats, rounds, send_delay=0.05, batch_size=100, rate_limits=True):
+    self.send_delay = send_delay
+    self.batch_size = batch_size
+    self.rate_limits = rate_limits
+    self.scripts = {chat_id: ["/start"] + ["Easy", "🟥"] * rounds
+                    for chat_id in range(1, chats + 1)}
+    self.position = dict.fromkeys(self.scripts, 0)
+    self.sent_at = {}
+    self.latencies = []
+    self.messages = 0
+    self.pending = []
+    self.update_id = 0
+    self.message_id = 0
+    self.has_updates = asyncio.Event()
+    self.finished = asyncio.Event()
+    self.started = None
+    self.elapsed = None
+    self.done_chats = 0
+    self.rate_limited = 0
+    self.bucket = outbox.TokenBucket(outbox.GLOBAL_RATE)
+    self.chat_buckets = {
+        chat_id: outbox.TokenBucket(outbox.PER_CHAT_RATE, outbox.PER_CHAT_BURST)
+        for chat_id in self.scripts}
+
+  def app(self):
+    app = web.Application()
+    app.router.add_route("*", "/bot{token}/{method}", self.dispatch)
+    return app
+
+  async def dispatch(self, request):
+    # getUpdates is a GET request with a form body, so parse the body by hand
+    params = dict(request.query)
+    params.update(parse_qsl((await request.read()).decode()))
+    method = request.match_info["method"]
+    handler = getattr(self, method, None)
+    if handler is None:
+      return web.json_response({"ok": True, "result": True})
+    try:
+      result = await handler(params)
+    except TooManyRequests:
+      return web.json_response({
+          "ok": False, "error_code": 429,
+          "description": "Too Many Requests: retry after 1",
+          "parameters": {"retry_after": 1},
+      }, status=429)
+    return web.json_response({"ok": True, "result": result})
+
+  def start(self):
+    self.started = time.perf_counter()
+    for chat_id in self.scripts:
+      self.user_says(chat_id)
+
+  def user_says(self, chat_id):
+    script = self.scripts[chat_id]
+    if self.position[chat_id] == len(script):
+      self.done_chats += 1
+      if self.done_chats == len(self.scripts):
+        self.elapsed = time.perf_counter() - self.started
+        self.finished.set()
+      return
+    text = script[self.position[chat_id]]
+    self.position[chat_id] += 1
+    self.update_id += 1
+    self.message_id += 1
+    self.pending.append({
+        "update_id": self.update_id,
+        "message": self.message(chat_id, text, from_user=True),
+    })
+    self.sent_at[chat_id] = time.perf_counter()
+    self.has_updates.set()
+
+  def message(self, chat_id, text, from_user=False):
+    message = {
+        "message_id": self.message_id,
+        "date": int(time.time()),
+        "chat": {"id": chat_id, "type": "private"},
+        "text": text,
+    }
+    if from_user:
+      message["from"] = {"id": chat_id, "is_bot": False, "first_name": f"user{chat_id}"}
+    return message
+
+  async def getMe(self, _params):
+    return {"id": 1, "is_bot": True, "first_name": "Fake", "username": "fake_bot"}
+
+  async def getUpdates(self, params):
+    offset = int(params.get("offset") or 0)
+    self.pending = [update for update in self.pending if update["update_id"] >= offset]
+    if not self.pending:
+      self.has_updates.clear()
+      try:
+        timeout = float(params.get("timeout") or 1)
+        await asyncio.wait_for(self.has_updates.wait(), timeout)
+      except asyncio.TimeoutError:
+        return []
+    limit = min(int(params.get("limit") or 100), self.batch_size)
+    return self.pending[:limit]
+
+  async def sendMessage(self, params):
+    # Round-trip time of the real API
+    if self.send_delay:
+      await asyncio.sleep(self.send_delay)
+    chat_id = int(params["chat_id"])
+    if self.rate_limits and not (
+        self.chat_buckets[chat_id].take() and self.bucket.take()):
+      self.rate_limited += 1
+      raise TooManyRequests
+    self.messages += 1
+    self.message_id += 1
+    if "reply_markup" in params:
+      self.latencies.append(time.perf_counter() - self.sent_at[chat_id])
+      self.user_says(chat_id)
+    return self.message(chat_id, params["text"])
+
+  def report(self):
+    elapsed = self.elapsed or time.perf_counter() - self.started
+    latencies = sorted(self.latencies)
+    return {
+        "chats": len(self.scripts),
+        "seconds": round(elapsed, 3),
+        "chats_per_second": round(len(self.scripts) / elapsed, 1),
+        "messages_per_second": round(self.messages / elapsed, 1),
+        "messages_per_round": round(self.messages / len(self.latencies) * 2, 2),
+        "rate_limited": self.rate_limited,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+    }
+
+
+class TooManyRequests(Exception):
+  pass
+
+
+def percentile(values, percent):
+  if not values:
+    return 0.0
+  index = min(len(values) - 1, round(percent / 100 * (len(values) - 1)))
+  return values[index]
+
+
+async def serve(api, host="127.0.0.1", port=0):
+  runner = web.AppRunner(api.app())
+  await runner.setup()
+  site = web.TCPSite(runner, host, port)
+  await site.start()
+  port = site._server.sockets[0].getsockname()[1]
+  return runner, port
+
+
+if __name__ == "__main__":
+  async def main():
+    api = FakeBotApi(chats=10, rounds=3)
+    runner, port = await serve(api, port=8081)
+    print(f"Fake Bot API on http://127.0.0.1:{port}/bot<token>/<method>")
+    api.start()
+    await api.finished.wait()
+    print(json.dumps(api.report()))
+    await runner.cleanup()
+
+  asyncio.run(main())
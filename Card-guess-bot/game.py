@@ -0,0 +1,114 @@
+import telebot
+
+import cards
+from cards import CARD_NAMES, CardDeck, Stats
+
+# Cards of every game come from one deck, the rounds are counted in one place
+deck = CardDeck()
+stats = Stats()
+
+
+# Keybord generation for handling with user. The keyboards never change, so
+# they are serialized once and the JSON is sent as reply markup.
+def keyboard(*rows):
+  markup = telebot.types.ReplyKeyboardMarkup()
+  for row in rows:
+    markup.row(*[telebot.types.KeyboardButton(label) for label in row])
+  return markup.to_json()
+
+
+LEVEL_KEYBOARD = keyboard(["Easy"], ["Middle"], ["Hard"])
+COLOR_KEYBOARD = keyboard(["🟥"], ["⬛️"])
+SUIT_KEYBOARD = keyboard(["Hearts"], ["Diamonds"], ["Spades"], ["Clubs"])
+EMPTY_KEYBOARD = keyboard()
+
+# Steps of the game: the step tells which answer the bot waits for
+LEVEL = "level"
+COLOR = "color"
+SUIT = "suit"
+NUMBER = "number"
+
+
+# The functions below return the replies as a list of (text, keyboard) pairs,
+# keyboard is None when the message is sent without reply markup.
+# They move the session to the step the bot waits for next.
+def start(session):
+  session.step = LEVEL
+  return [("Choose the level: Easy, Middle, Hard", LEVEL_KEYBOARD)]
+
+
+# Choose the level of game
+def level_answer(session, text):
+  if text == 'Easy':
+    session.step = COLOR
+    return [
+        ("You chose the easy level. "
+         "Your task is only to guess the color of my card.", None),
+        ("Guess the color: 🟥 or ⬛️", COLOR_KEYBOARD),
+    ]
+  if text == 'Middle':
+    session.step = SUIT
+    return [
+        ("You chose the middle level. "
+         "Your task is to guess the suit of my card.", None),
+        ("Guess the card suit: Hearts, Diamonds, Spades or Clubs", SUIT_KEYBOARD),
+    ]
+  if text == 'Hard':
+    session.step = NUMBER
+    return [
+        ("You chose the hard level. Your task is to guess the number of my card. "
+         "It's not so easy. There are 13 options:)", None),
+        ("Guess the card number: 2, 3, 4, 5, 6, 7, 8, 9, 10, J, Q, K or A. "
+         "Type in the chat", EMPTY_KEYBOARD),
+    ]
+  if text.lower() in ['exit', '/exit']:
+    session.step = None
+    return [("Thanks for the game! Have a nice day! Bye!", None)]
+
+  return [("Such level does not exist.", EMPTY_KEYBOARD)] + start(session)
+
+
+INVALID_ANSWERS = {
+    COLOR: "Such color doesn't exist.",
+    SUIT: "Such card suit doesn't exist.",
+    NUMBER: "Such card doesn't exist.",
+}
+
+
+# Answer comparison. Returns the reply text and whether the guess won,
+# None when the answer is not a valid guess.
+def evaluate_answer(session, text):
+  card = deck.draw()
+  won = cards.check(session.step, text, card)
+  if won is None:
+    return INVALID_ANSWERS[session.step], None
+  stats.record(session.step, won)
+  if won:
+    return f"Correct! The card was: {CARD_NAMES[card]}. Congratulations!", True
+  return f"Incorrect! The card was: {CARD_NAMES[card]}. Good luck next time!", False
+
+
+# Share of won rounds of the chat and of all players
+def show_stats(session):
+  rounds = session.wins + session.losses
+  rate = session.wins / rounds if rounds else 0
+  return [(f"You won {session.wins} of {rounds} rounds ({rate:.0%}). "
+           f"All players win {stats.win_rate():.0%} of rounds.", None)]
+
+
+# Handle a message of the chat: /start begins a game, other messages answer
+# the current step. Messages outside of a game get no reply.
+def handle(session, text):
+  text = text or ""
+  if text == "/start":
+    return start(session)
+  if text == "/stats":
+    return show_stats(session)
+  if session.step == LEVEL:
+    return level_answer(session, text)
+  if session.step in INVALID_ANSWERS:
+    reply, won = evaluate_answer(session, text)
+    if won is not None:
+      session.record(won)
+    return [(reply, None)] + start(session)
+  return []
@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# Telegram refuses longer messages
+MAX_MESSAGE_LENGTH = 4096
+# Telegram limits: about one message per second in a chat (short bursts are
+# fine) and about 30 messages per second for the whole bot
+PER_CHAT_RATE = 1
+PER_CHAT_BURST = 3
+GLOBAL_RATE = 30
+
+
+class TokenBucket:
+  def __init__(self, rate, capacity=None):
+    self.rate = rate
+    self.capacity = capacity or rate
+    self.tokens = self.capacity
+    self.stamp = time.monotonic()
+
+  def _refill(self):
+    now = time.monotonic()
+    self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+    self.stamp = now
+
+  # Take a token if there is one
+  def take(self):
+    self._refill()
+    if self.tokens >= 1:
+      self.tokens -= 1
+      return True
+    return False
+
+  # Reserve a token and return how long to wait for it
+  def reserve(self):
+    self._refill()
+    self.tokens -= 1
+    return max(0.0, -self.tokens / self.rate)
+
+  async def acquire(self):
+    delay = self.reserve()
+    if delay:
+      await asyncio.sleep(delay)
+
+  def full(self):
+    self._refill()
+    return self.tokens >= self.capacity
+
+
+def take_message(replies):
+  """Join replies from the front of the list into one message.
+
+  Returns the text, the keyboard and how many replies went into the message.
+  A merged message carries the last keyboard of its parts: the client only
+  shows the latest keyboard anyway, and a message without one keeps it.
+  """
+  text, keyboard = replies[0]
+  count = 1
+  while count < len(replies):
+    next_text, next_keyboard = replies[count]
+    if len(text) + len(next_text) + 2 > MAX_MESSAGE_LENGTH:
+      break
+    text = f"{text}\n\n{next_text}"
+    if next_keyboard is not None:
+      keyboard = next_keyboard
+    count += 1
+  return text, keyboard, count
+
+
+# Join consecutive (text, keyboard) replies into as few messages as possible
+def merge(replies):
+  messages = []
+  while replies:
+    text, keyboard, count = take_message(replies)
+    messages.append((text, keyboard))
+    replies = replies[count:]
+  return messages
+
+
+def retry_after(error):
+  if getattr(error, "error_code", None) != 429:
+    return None
+  parameters = getattr(error, "result_json", {}).get("parameters", {})
+  return parameters.get("retry_after", 1)
+
+
+class Outbox:
+  """Per-chat send queue that respects the Telegram rate limits.
+
+  Replies waiting for the same chat are merged into one message, and a 429
+  answer pauses the chat for retry_after seconds before sending again.
+  """
+
+  def __init__(self, send, per_chat_rate=PER_CHAT_RATE, per_chat_burst=PER_CHAT_BURST,
+               global_rate=GLOBAL_RATE):
+    self.send = send
+    self.per_chat_rate = per_chat_rate
+    self.per_chat_burst = per_chat_burst
+    self.bucket = TokenBucket(global_rate)
+    self.sent = 0
+    self._queues = {}
+    self._buckets = {}
+    self._tasks = set()
+
+  def submit(self, chat_id, replies):
+    queue = self._queues.get(chat_id)
+    if queue is not None:
+      queue.extend(replies)
+      return
+    self._queues[chat_id] = deque(replies)
+    task = asyncio.create_task(self._drain(chat_id))
+    self._tasks.add(task)
+    task.add_done_callback(self._tasks.discard)
+
+  def _chat_bucket(self, chat_id):
+    bucket = self._buckets.get(chat_id)
+    if bucket is None:
+      # Buckets of quiet chats are full again and can be forgotten
+      if len(self._buckets) > 10_000:
+        self._buckets = {key: value for key, value in self._buckets.items()
+                         if key in self._queues or not value.full()}
+      bucket = TokenBucket(self.per_chat_rate, self.per_chat_burst)
+      self._buckets[chat_id] = bucket
+    return bucket
+
+  async def _drain(self, chat_id):
+    queue = self._queues[chat_id]
+    bucket = self._chat_bucket(chat_id)
+    try:
+      while queue:
+        await bucket.acquire()
+        await self.bucket.acquire()
+        # Everything queued while waiting for the tokens goes out together
+        text, keyboard, count = take_message(queue)
+        try:
+          await self.send(chat_id, text, keyboard)
+          self.sent += 1
+        except Exception as error:
+          delay = retry_after(error)
+          if delay is not None:
+            await asyncio.sleep(delay)
+            continue
+          logger.exception("Sending to chat %s failed", chat_id)
+        for _ in range(count):
+          queue.popleft()
+    finally:
+      del self._queues[chat_id]
+
+  async def join(self):
+    while self._tasks:
+      await asyncio.gather(*list(self._tasks))
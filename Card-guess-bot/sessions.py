@@ -0,0 +1,171 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+# The backend drops expired sessions once every so many writes
+EXPIRE_EVERY = 1000
+
+
+@dataclass(slots=True)
+class Session:
+  """Game state of one chat."""
+  chat_id: int
+  # The answer the bot waits for, None when no game is running
+  step: str | None = None
+  wins: int = 0
+  losses: int = 0
+  updated: float = field(default_factory=time.time)
+
+  def record(self, won):
+    if won:
+      self.wins += 1
+    else:
+      self.losses += 1
+
+
+class MemoryStore:
+  """Bounded in-memory store: least recently used sessions are evicted first,
+  and sessions untouched for longer than ttl seconds are dropped."""
+
+  def __init__(self, max_sessions=10_000, ttl=24 * 60 * 60):
+    self.max_sessions = max_sessions
+    self.ttl = ttl
+    self._sessions = OrderedDict()
+    self._lock = threading.Lock()
+
+  def __len__(self):
+    return len(self._sessions)
+
+  def get(self, chat_id):
+    with self._lock:
+      session = self._sessions.get(chat_id)
+      if session is None:
+        return None
+      if session.updated < time.time() - self.ttl:
+        del self._sessions[chat_id]
+        return None
+      self._sessions.move_to_end(chat_id)
+      return session
+
+  def put(self, session):
+    session.updated = time.time()
+    with self._lock:
+      self._sessions[session.chat_id] = session
+      self._sessions.move_to_end(session.chat_id)
+      self._evict(session.updated - self.ttl)
+
+  def delete(self, chat_id):
+    with self._lock:
+      self._sessions.pop(chat_id, None)
+
+  def clear(self):
+    with self._lock:
+      self._sessions.clear()
+
+  # Drop the sessions of the chats that keep(chat_id) rejects
+  def keep_only(self, keep):
+    with self._lock:
+      for chat_id in [chat_id for chat_id in self._sessions if not keep(chat_id)]:
+        del self._sessions[chat_id]
+
+  # Sessions are ordered by last update, so the expired ones are at the front
+  def _evict(self, expired_before):
+    sessions = self._sessions
+    while sessions:
+      oldest = next(iter(sessions.values()))
+      if len(sessions) <= self.max_sessions and oldest.updated >= expired_before:
+        break
+      sessions.popitem(last=False)
+
+
+class SQLiteStore:
+  """Sessions on disk, so a restarted worker continues every game."""
+
+  def __init__(self, path):
+    self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+    self._db.execute("PRAGMA journal_mode=WAL")
+    self._db.execute("PRAGMA synchronous=NORMAL")
+    self._db.execute(
+        "CREATE TABLE IF NOT EXISTS sessions (chat_id INTEGER PRIMARY KEY, "
+        "step TEXT, wins INTEGER, losses INTEGER, updated REAL)")
+    self._lock = threading.Lock()
+
+  def __len__(self):
+    with self._lock:
+      return self._db.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+  def get(self, chat_id):
+    with self._lock:
+      row = self._db.execute(
+          "SELECT chat_id, step, wins, losses, updated FROM sessions "
+          "WHERE chat_id = ?", (chat_id,)).fetchone()
+    return Session(*row) if row else None
+
+  def put(self, session):
+    session.updated = time.time()
+    with self._lock:
+      self._db.execute(
+          "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?)",
+          (session.chat_id, session.step, session.wins, session.losses,
+           session.updated))
+
+  def delete(self, chat_id):
+    with self._lock:
+      self._db.execute("DELETE FROM sessions WHERE chat_id = ?", (chat_id,))
+
+  # Remove sessions untouched for longer than ttl seconds
+  def expire(self, ttl):
+    with self._lock:
+      self._db.execute("DELETE FROM sessions WHERE updated < ?", (time.time() - ttl,))
+
+  def close(self):
+    self._db.close()
+
+
+class SessionStore:
+  """Memory cache in front of an optional SQLite backend (write-through).
+
+  The backend expires sessions on open and every EXPIRE_EVERY writes, so it
+  keeps the same ttl as the cache instead of every chat ever seen.
+  """
+
+  def __init__(self, path=None, max_sessions=10_000, ttl=24 * 60 * 60):
+    self.ttl = ttl
+    self.cache = MemoryStore(max_sessions, ttl)
+    self.backend = SQLiteStore(path) if path else None
+    self._writes = 0
+    if self.backend is not None:
+      self.backend.expire(ttl)
+
+  def get(self, chat_id):
+    session = self.cache.get(chat_id)
+    if session is None and self.backend is not None:
+      session = self.backend.get(chat_id)
+      if session is not None:
+        self.cache.put(session)
+    return session
+
+  # Session of the chat, a new one if the chat has none yet
+  def load(self, chat_id):
+    return self.get(chat_id) or Session(chat_id)
+
+  def put(self, session):
+    self.cache.put(session)
+    if self.backend is not None:
+      self.backend.put(session)
+      # Threads may race on the count, which only moves an expiry a little
+      self._writes += 1
+      if self._writes >= EXPIRE_EVERY:
+        self._writes = 0
+        self.backend.expire(self.ttl)
+
+  def delete(self, chat_id):
+    self.cache.delete(chat_id)
+    if self.backend is not None:
+      self.backend.delete(chat_id)
+
+  def close(self):
+    if self.backend is not None:
+      self.backend.close()
@@ -0,0 +1,26 @@
+import bisect
+import hashlib
+
+
+def _hash(key):
+  digest = hashlib.blake2b(str(key).encode(), digest_size=8).digest()
+  return int.from_bytes(digest, "big")
+
+
+class HashRing:
+  """Consistent hash ring that maps chat ids to worker numbers.
+
+  Every worker owns many points on the ring, so when a worker is added or
+  removed only about 1/N of the chats move to another worker.
+  """
+
+  def __init__(self, workers, replicas=128):
+    self.workers = workers
+    points = sorted((_hash(f"{worker}:{replica}"), worker)
+                    for worker in range(workers) for replica in range(replicas))
+    self._hashes = [point for point, _ in points]
+    self._owners = [worker for _, worker in points]
+
+  def lookup(self, chat_id):
+    index = bisect.bisect(self._hashes, _hash(chat_id)) % len(self._hashes)
+    return self._owners[index]
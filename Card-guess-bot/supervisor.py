@@ -0,0 +1,236 @@
+"""Multi-process mode: one receiver polls Telegram, N workers play the games.
+
+  python supervisor.py --workers 8
+
+Every chat belongs to one worker, chosen by a consistent hash of the chat id,
+so the games of a chat stay in order. Send SIGUSR1 to add a worker and SIGUSR2
+to remove one; the chats are rebalanced over the new workers.
+"""
+import argparse
+import asyncio
+import contextlib
+import logging
+import multiprocessing
+import queue
+import signal
+import time
+
+import telebot
+from telebot import apihelper, asyncio_helper
+from telebot.async_telebot import AsyncTeleBot
+
+import async_main
+import outbox
+from dispatcher import ChatDispatcher
+from sessions import SessionStore
+from sharding import HashRing
+
+logger = logging.getLogger(__name__)
+
+# Control items are (command, (global rate, number of workers)), updates are
+# (chat_id, text)
+FLUSH = "flush"
+STOP = "stop"
+# How long the supervisor waits for the workers to answer a control item
+ACK_TIMEOUT = 60
+
+
+def run_worker(number, token, updates, acks, sessions_db, api_url, global_rate,
+               per_chat_rate):
+  # Ctrl+C stops the supervisor, which then stops the workers in order
+  signal.signal(signal.SIGINT, signal.SIG_IGN)
+  if api_url:
+    asyncio_helper.API_URL = api_url
+  asyncio.run(serve_shard(number, token, updates, acks, sessions_db, global_rate,
+                          per_chat_rate))
+
+
+async def serve_shard(number, token, updates, acks, sessions_db, global_rate,
+                      per_chat_rate):
+  bot = AsyncTeleBot(token)
+  store = SessionStore(sessions_db)
+  handle, chat_outbox = async_main.create_handler(
+      bot, store, global_rate=global_rate, per_chat_rate=per_chat_rate)
+  dispatcher = ChatDispatcher(handle)
+  loop = asyncio.get_running_loop()
+  try:
+    while True:
+      chat_id, value = await loop.run_in_executor(None, updates.get)
+      if chat_id not in (FLUSH, STOP):
+        dispatcher.submit(chat_id, value)
+        continue
+      # Finish the queued work, so another worker can take these chats over
+      await dispatcher.join()
+      await chat_outbox.join()
+      rate, workers = value
+      if chat_id == FLUSH:
+        # Only the chats that move to another worker leave the cache
+        ring = HashRing(workers)
+        store.cache.keep_only(lambda chat, ring=ring: ring.lookup(chat) == number)
+      chat_outbox.bucket = outbox.TokenBucket(rate)
+      acks.put(number)
+      if chat_id == STOP:
+        break
+  finally:
+    store.close()
+    if asyncio_helper.session_manager.session is not None:
+      await asyncio_helper.session_manager.session.close()
+
+
+class Supervisor:
+  def __init__(self, token, workers, sessions_db=async_main.SESSIONS_DB, api_url=None,
+               global_rate=outbox.GLOBAL_RATE, per_chat_rate=outbox.PER_CHAT_RATE,
+               poll_timeout=20):
+    self.token = token
+    self.sessions_db = sessions_db
+    self.api_url = api_url
+    self.global_rate = global_rate
+    self.per_chat_rate = per_chat_rate
+    self.poll_timeout = poll_timeout
+    self.bot = telebot.TeleBot(token)
+    self.context = multiprocessing.get_context("spawn")
+    self.acks = self.context.Queue()
+    self.workers = []
+    self.ring = None
+    self.wanted = workers
+    self.running = False
+    self.received = 0
+
+  # The global rate limit is shared by the workers
+  def _worker_rate(self):
+    return self.global_rate / max(1, self.wanted)
+
+  def _start_worker(self, number):
+    updates = self.context.Queue()
+    process = self.context.Process(
+        target=run_worker, daemon=True,
+        args=(number, self.token, updates, self.acks, self.sessions_db, self.api_url,
+              self._worker_rate(), self.per_chat_rate))
+    process.start()
+    return process, updates
+
+  def _broadcast(self, command):
+    for _, updates in self.workers:
+      updates.put((command, (self._worker_rate(), self.wanted)))
+    self._wait_for_acks(dict(enumerate(process for process, _ in self.workers)))
+
+  # Wait for an ack from each of the {number: process} workers, but not for
+  # workers that died or longer than ACK_TIMEOUT
+  def _wait_for_acks(self, workers):
+    deadline = time.monotonic() + ACK_TIMEOUT
+    while workers:
+      try:
+        workers.pop(self.acks.get(timeout=1), None)
+        continue
+      except queue.Empty:
+        pass
+      for number, process in list(workers.items()):
+        if not process.is_alive():
+          logger.warning("Worker %s died before it answered", number)
+          del workers[number]
+      if workers and time.monotonic() > deadline:
+        logger.warning("Workers %s did not answer in time", sorted(workers))
+        return
+
+  # Start or stop workers until there are self.wanted of them
+  def rebalance(self):
+    while len(self.workers) > self.wanted:
+      process, updates = self.workers.pop()
+      updates.put((STOP, (0, 0)))
+      self._wait_for_acks({len(self.workers): process})
+      process.join(ACK_TIMEOUT)
+      if process.is_alive():
+        process.terminate()
+    if self.workers:
+      # Every worker finishes its chats before they can move
+      self._broadcast(FLUSH)
+    while len(self.workers) < self.wanted:
+      self.workers.append(self._start_worker(len(self.workers)))
+    self.ring = HashRing(len(self.workers))
+    logger.info("Running %s workers", len(self.workers))
+
+  def resize(self, workers):
+    self.wanted = max(1, workers)
+
+  # Restart crashed workers, their chats stay with the same number
+  def _check_workers(self):
+    for number, (process, updates) in enumerate(self.workers):
+      if not process.is_alive():
+        logger.warning("Worker %s died, restarting it", number)
+        self.workers[number] = self._start_worker(number)
+        self._reroute(updates, self.workers[number][1])
+
+  # Move the updates the dead worker never read to the queue of its successor
+  def _reroute(self, old, new):
+    moved = 0
+    while True:
+      try:
+        # A short wait lets the feeder thread flush what is still buffered
+        chat_id, value = old.get(timeout=0.1)
+      except queue.Empty:
+        break
+      # The control items were answered for the dead worker already
+      if chat_id not in (FLUSH, STOP):
+        new.put((chat_id, value))
+        moved += 1
+    # A worker killed inside get() keeps the queue locked; what is left is lost
+    left = old.qsize()
+    if left:
+      logger.warning("Lost %s updates of a dead worker", left)
+    old.cancel_join_thread()
+    old.close()
+    logger.info("Moved %s updates to the restarted worker", moved)
+
+  def route(self, chat_id, text):
+    self.workers[self.ring.lookup(chat_id)][1].put((chat_id, text))
+    self.received += 1
+
+  def run(self):
+    if self.api_url:
+      apihelper.API_URL = self.api_url
+    self.running = True
+    self.rebalance()
+    offset = None
+    try:
+      while self.running:
+        if self.wanted != len(self.workers):
+          self.rebalance()
+        self._check_workers()
+        try:
+          updates = self.bot.get_updates(
+              offset=offset, timeout=self.poll_timeout + 5,
+              long_polling_timeout=self.poll_timeout)
+        except Exception:
+          logger.exception("Getting updates failed")
+          time.sleep(1)
+          continue
+        for update in updates:
+          offset = update.update_id + 1
+          message = update.message
+          if message is not None and message.text is not None:
+            self.route(message.chat.id, message.text)
+    finally:
+      self.wanted = 0
+      self._broadcast(STOP)
+      for process, _ in self.workers:
+        process.join(ACK_TIMEOUT)
+        if process.is_alive():
+          process.terminate()
+      self.workers = []
+
+  def stop(self):
+    self.running = False
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser()
+  parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+  args = parser.parse_args()
+  logging.basicConfig(level=logging.INFO)
+
+  supervisor = Supervisor(async_main.TOKEN, args.workers)
+  signal.signal(signal.SIGUSR1, lambda *_: supervisor.resize(supervisor.wanted + 1))
+  signal.signal(signal.SIGUSR2, lambda *_: supervisor.resize(supervisor.wanted - 1))
+  signal.signal(signal.SIGTERM, lambda *_: supervisor.stop())
+  with contextlib.suppress(KeyboardInterrupt):
+    supervisor.run()
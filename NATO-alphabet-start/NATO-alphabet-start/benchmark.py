@@ -0,0 +1,135 @@
+"""MB/s of the phonetic encoder against the dict comprehension it replaces,
+and of the decoder on clean and noisy transcripts.
+
+  python benchmark.py --megabytes 8
+  python benchmark.py --only decode --megabytes 16
+"""
+import argparse
+import difflib
+import io
+import random
+import string
+import time
+
+from decoder import Decoder
+from phonetic import Encoder, load_alphabet
+
+# Share of the code words misspelled, and run together with the next one
+MISSPELLED = 0.1
+RUN_TOGETHER = 0.03
+
+
+def sample_words(megabytes, seed=1):
+    rng = random.Random(seed)
+    words = []
+    size = 0
+    while size < megabytes * 1_000_000:
+        word = ''.join(rng.choices(string.ascii_letters, k=rng.randint(3, 12)))
+        words.append(word)
+        size += len(word) + 1
+    return words
+
+
+def measure(function, size):
+    start = time.perf_counter()
+    function()
+    return size / (time.perf_counter() - start) / 1_000_000
+
+
+def run_encode(megabytes):
+    words = sample_words(megabytes)
+    text = '\n'.join(words)
+    size = len(text)
+    phonetic_dict = load_alphabet()
+    encoder = Encoder()
+
+    # What main.py did for every word
+    def old_encode(word):
+        return [phonetic_dict[letter] for letter in word.upper()]
+
+    def dict_comprehension():
+        for word in words:
+            old_encode(word)
+
+    def encode_words():
+        encode = encoder.encode
+        for word in words:
+            encode(word)
+
+    def dict_comprehension_bulk():
+        ' '.join(phonetic_dict.get(letter, letter) for letter in text.upper())
+
+    def stream():
+        encoder.encode_stream(io.StringIO(text), io.StringIO())
+
+    return {
+        'dict_comprehension_per_word': measure(dict_comprehension, size),
+        'encoder_per_word': measure(encode_words, size),
+        'dict_comprehension_bulk': measure(dict_comprehension_bulk, size),
+        'encoder_stream': measure(stream, size),
+    }
+
+
+def transcripts(megabytes, seed=1):
+    """Clean and noisy lines of code words, and the words they spell."""
+    rng = random.Random(seed)
+    encoder = Encoder()
+    words = sample_words(megabytes / 6, seed)
+    clean, noisy, expected = [], [], []
+    for start in range(0, len(words), 8):
+        line = ' '.join(words[start:start + 8])
+        expected.append(line.upper())
+        codes = encoder.encode_text(line).strip(' ').split(' ')
+        clean.append(' '.join(codes))
+        noisy_codes = []
+        for code in codes:
+            if code and rng.random() < MISSPELLED:
+                position = rng.randrange(len(code))
+                code = code[:position] + rng.choice(string.ascii_lowercase) + code[position + 1:]
+            if noisy_codes and noisy_codes[-1] and code and rng.random() < RUN_TOGETHER:
+                noisy_codes[-1] += code
+            else:
+                noisy_codes.append(code)
+        noisy.append(' '.join(noisy_codes))
+    return clean, noisy, expected
+
+
+def run_decode(megabytes):
+    clean, noisy, expected = transcripts(megabytes)
+    words = {code.lower(): letter for letter, code in load_alphabet().items()}
+    results = {}
+
+    # A dict per word with difflib for the misses, the obvious way to do it
+    def naive(line):
+        letters = []
+        for word in line.lower().split(' '):
+            letter = words.get(word)
+            if letter is None:
+                close = difflib.get_close_matches(word, words, n=1) if word else None
+                letter = words[close[0]] if close else ' ' if not word else '?'
+            letters.append(letter)
+        return ''.join(letters)
+
+    for name, lines in (('clean', clean), ('noisy', noisy)):
+        size = sum(len(line) + 1 for line in lines)
+        for decoder_name, decode_batch in (('naive', lambda batch: [naive(line) for line in batch]),
+                                           ('decoder', Decoder().decode_batch)):
+            start = time.perf_counter()
+            decoded = decode_batch(lines)
+            seconds = time.perf_counter() - start
+            right = sum(line == truth for line, truth in zip(decoded, expected))
+            results[f'{decoder_name}_{name}'] = (size / seconds / 1_000_000, right / len(lines))
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--megabytes', type=float, default=8)
+    parser.add_argument('--only', choices=['encode', 'decode'])
+    args = parser.parse_args()
+    if args.only != 'decode':
+        for name, megabytes_per_second in run_encode(args.megabytes).items():
+            print(f'{name:>28}: {megabytes_per_second:8.1f} MB/s')
+    if args.only != 'encode':
+        for name, (megabytes_per_second, right) in run_decode(args.megabytes).items():
+            print(f'{name:>28}: {megabytes_per_second:8.1f} MB/s, {right:.1%} of lines right')
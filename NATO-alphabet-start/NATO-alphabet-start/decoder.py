@@ -0,0 +1,147 @@
+"""NATO code words back to letters, forgiving run-together and misspelled words.
+
+  python decoder.py transcript.txt
+  echo "alfa bravo charlee" | python decoder.py
+"""
+import sys
+
+from phonetic import load_alphabet
+
+# Spellings heard often enough to accept as they are
+ALIASES = {'alpha': 'A', 'juliett': 'J', 'xray': 'X'}
+# A misspelled word may be this many edits from its code word, and at most a
+# third of its length, so that short noise does not turn into letters
+MAX_DISTANCE = 2
+UNKNOWN = '?'
+CACHE_SIZE = 100_000
+
+
+def edit_distance(word, other, limit):
+    """Levenshtein distance, or limit + 1 as soon as it must exceed limit."""
+    if abs(len(word) - len(other)) > limit:
+        return limit + 1
+    previous = list(range(len(other) + 1))
+    for row, character in enumerate(word, 1):
+        current = [row]
+        for column, other_character in enumerate(other, 1):
+            current.append(min(previous[column] + 1, current[column - 1] + 1,
+                               previous[column - 1] + (character != other_character)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class Decoder:
+    """Decodes transcripts of code words separated by spaces.
+
+    Most words are spelled right and are found with one dict lookup after a
+    split. Only the rest goes through the trie of code words, which splits
+    words that ran together ("alfabravo") in one pass, always taking the
+    longest code word that fits. What the trie cannot read is matched to the
+    nearest code word within MAX_DISTANCE edits, or becomes UNKNOWN; those
+    answers are cached, because the same misspellings come back. An empty
+    word, left by two spaces in a row, is the gap between two words.
+    """
+
+    def __init__(self, path=None):
+        alphabet = load_alphabet(path) if path else load_alphabet()
+        self.words = {code.lower(): letter for letter, code in alphabet.items()}
+        self.words.update(ALIASES)
+        self.trie = {}
+        for word, letter in self.words.items():
+            node = self.trie
+            for character in word:
+                node = node.setdefault(character, {})
+            node[''] = letter
+        self._cache = {}
+
+    def decode(self, text):
+        words = self.words
+        cache = self._cache
+        letters = []
+        for word in text.strip(' ').lower().split(' '):
+            letter = words.get(word)
+            if letter is None:
+                if not word:
+                    letter = ' '
+                else:
+                    letter = cache.get(word)
+                    if letter is None:
+                        letter = self._decode_word(word)
+                        if len(cache) >= CACHE_SIZE:
+                            cache.clear()
+                        cache[word] = letter
+            letters.append(letter)
+        return ''.join(letters)
+
+    def decode_batch(self, texts):
+        decode = self.decode
+        return [decode(text) for text in texts]
+
+    def decode_stream(self, source, target):
+        """Decodes line by line, so memory stays bounded for any file size."""
+        decode = self.decode
+        for line in source:
+            target.write(decode(line))
+
+    def _decode_word(self, word):
+        letters = []
+        start = 0
+        while start < len(word):
+            character = word[start]
+            if not (character.isalpha() or character == '-'):
+                # Digits, punctuation and line ends stay as they are
+                letters.append(character)
+                start += 1
+                continue
+            end = start
+            while end < len(word) and (word[end].isalpha() or word[end] == '-'):
+                end += 1
+            letters.append(self._split_run(word[start:end]))
+            start = end
+        return ''.join(letters)
+
+    def _split_run(self, run):
+        letters = []
+        start = 0
+        while start < len(run):
+            node = self.trie
+            match = None
+            position = start
+            while position < len(run):
+                node = node.get(run[position])
+                if node is None:
+                    break
+                position += 1
+                if '' in node:
+                    match = (position, node[''])
+            if match is None:
+                # The trie is stuck: the rest is one misspelled code word or noise
+                letters.append(self._closest(run[start:]))
+                break
+            start, letter = match
+            letters.append(letter)
+        return ''.join(letters)
+
+    def _closest(self, word):
+        limit = min(MAX_DISTANCE, len(word) // 3)
+        best = UNKNOWN
+        best_distance = limit + 1
+        for code_word, letter in self.words.items():
+            distance = edit_distance(word, code_word, min(limit, best_distance))
+            if distance < best_distance:
+                best, best_distance = letter, distance
+            elif distance == best_distance and letter != best:
+                # Equally near to two letters: no way to tell which was meant
+                best = UNKNOWN
+        return best if best_distance <= limit else UNKNOWN
+
+
+if __name__ == '__main__':
+    decoder = Decoder()
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], encoding='utf-8') as source:
+            decoder.decode_stream(source, sys.stdout)
+    else:
+        decoder.decode_stream(sys.stdin, sys.stdout)
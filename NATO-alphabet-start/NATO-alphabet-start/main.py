@@ -1,5 +1,5 @@
 student_dict = {
-    "student": ["Angela", "James", "Lily"], 
+    "student": ["Angela", "James", "Lily"],
     "score": [56, 76, 98]
 }
 
@@ -8,36 +8,25 @@ for (key, value) in student_dict.items():
     #Access key and value
     pass
 
-import pandas
-student_data_frame = pandas.DataFrame(student_dict)
-
-#Loop through rows of a data frame
-for (index, row) in student_data_frame.iterrows():
-    #Access index and row
-    #Access row.student or row.score
-    pass
-
-# Keyword Method with iterrows()
-# {new_key:new_value for (index, row) in df.iterrows()}
+from phonetic import Encoder
 
 #TODO 1. Create a dictionary in this format:
-data = pandas.read_csv('nato_phonetic_alphabet.csv')
-print(data.to_dict())
-phonetic_dict = {row.letter: row.code for (index, row) in data.iterrows()}
+encoder = Encoder()    # the csv is read once, without pandas
+phonetic_dict = encoder.alphabet
 print(phonetic_dict)
 # {"A": "Alfa", "B": "Bravo"}
 
 #TODO 2. Create a list of the phonetic code words from a word that the user inputs.
 def generate_phonetic():
-    word = input('Enter the word: ').upper()    # user's word
-
-    try:
-        output_list = [phonetic_dict[letter] for letter in word]   # each letter of user's word we convert to appropriate values
-    except KeyError:
-        print('Sorry, only letters in the alphabet please.')
-        generate_phonetic()
-    else:
-        print(output_list)
+    while True:    # ask again on bad input, without recursing
+        word = input('Enter the word: ')    # user's word
+        try:
+            output_list = encoder.encode(word)    # each letter of user's word we convert to appropriate values
+        except ValueError:
+            print('Sorry, only letters in the alphabet please.')
+        else:
+            print(output_list)
+            return
 
 
 generate_phonetic()
@@ -0,0 +1,69 @@
+"""Letters to NATO code words, with a table built once from the CSV.
+
+  python phonetic.py big.txt > big.nato.txt
+  echo "hello world" | python phonetic.py
+"""
+import csv
+import sys
+
+ALPHABET_PATH = 'nato_phonetic_alphabet.csv'
+CHUNK_SIZE = 1 << 16
+
+
+def load_alphabet(path=ALPHABET_PATH):
+    with open(path, newline='', encoding='utf-8') as alphabet_file:
+        return {row['letter']: row['code'] for row in csv.DictReader(alphabet_file)}
+
+
+class Encoder:
+    """Encodes with lookup tables built once from the alphabet.
+
+    A single word is looked up letter by letter in the alphabet dict, which
+    is already as fast as Python gets for a few letters. Text goes through a
+    list of 256 strings indexed by the byte of a Latin-1 character: the code
+    word and a space for letters, the character itself for anything else. On
+    this data that beats str.translate with a dict, whose many-character
+    replacements take CPython's slow path.
+    """
+
+    def __init__(self, path=ALPHABET_PATH):
+        self.alphabet = load_alphabet(path)
+        self.spaced = {letter: code + ' ' for letter, code in self.alphabet.items()}
+        self.spaced.update((letter.lower(), code) for letter, code in list(self.spaced.items()))
+        self.table = [self.spaced.get(chr(byte), chr(byte)) for byte in range(256)]
+
+    def encode(self, word):
+        """The code words of word; ValueError if it has anything but letters."""
+        alphabet = self.alphabet
+        try:
+            return [alphabet[letter] for letter in word.upper()]
+        except KeyError as error:
+            raise ValueError(f'not a letter of the alphabet: {error.args[0]!r}') from None
+
+    def encode_text(self, text):
+        """Encodes the letters of any text, other characters stay as they are."""
+        try:
+            data = text.encode('latin-1')
+        except UnicodeEncodeError:
+            spaced = self.spaced
+            return ''.join([spaced.get(character, character) for character in text])
+        table = self.table
+        return ''.join([table[byte] for byte in data])
+
+    def encode_stream(self, source, target, chunk_size=CHUNK_SIZE):
+        """Encodes a text file in chunks, so memory stays bounded for any size.
+
+        Each letter is encoded on its own, so a chunk may end anywhere.
+        """
+        encode_text = self.encode_text
+        for chunk in iter(lambda: source.read(chunk_size), ''):
+            target.write(encode_text(chunk))
+
+
+if __name__ == '__main__':
+    encoder = Encoder()
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], encoding='utf-8') as source:
+            encoder.encode_stream(source, sys.stdout)
+    else:
+        encoder.encode_stream(sys.stdin, sys.stdout)
@@ -0,0 +1,58 @@
+import random
+
+from physics import BALL_RADIUS, PADDLE_HALF_HEIGHT, PADDLE_HALF_WIDTH, WALL_Y
+
+
+def predict_intercept(ball, paddle_x):
+    """The y at which the ball reaches the face of the paddle at paddle_x.
+
+    Bounces off the walls are mirror images, so the straight-line y is folded
+    back into the court instead of simulating the flight.
+    """
+    face = paddle_x - ball.dx * (PADDLE_HALF_WIDTH + BALL_RADIUS)
+    time_to_face = (face - ball.x) / (ball.dx * ball.speed)
+    y = ball.y + ball.dy * ball.speed * time_to_face
+
+    limit = WALL_Y - BALL_RADIUS
+    period = 4 * limit
+    y = (y + limit) % period
+    if y > 2 * limit:
+        y = period - y
+    return y - limit
+
+
+class AIPlayer:
+    """Steers a paddle to where the ball will arrive.
+
+    The intercept is solved once each time the ball turns towards the paddle,
+    missed by a random error of up to error pixels, so a larger error is an
+    easier opponent. While the ball flies away the paddle goes back to the
+    middle.
+    """
+
+    def __init__(self, game, paddle, error=0.0, seed=None):
+        self.game = game
+        self.paddle = paddle
+        self.error = error
+        self.random = random.Random(seed)
+        # The side the paddle is on, in the direction of the ball's dx
+        self.side = 1 if paddle.x > 0 else -1
+        self.target = 0.0
+        self._ball_dx = None
+
+    def control(self):
+        ball = self.game.ball
+        if ball.dx != self._ball_dx:
+            self._ball_dx = ball.dx
+            if ball.dx == self.side:
+                self.target = predict_intercept(ball, self.paddle.x)
+                self.target += self.random.uniform(-self.error, self.error)
+            else:
+                self.target = 0.0
+
+        # Stop inside a small band so the paddle does not jitter
+        offset = self.target - self.paddle.y
+        if abs(offset) < PADDLE_HALF_HEIGHT / 4:
+            self.paddle.direction = 0
+        else:
+            self.paddle.direction = 1 if offset > 0 else -1
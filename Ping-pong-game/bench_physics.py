@@ -0,0 +1,42 @@
+"""Steps per second of the headless physics; test_physics.py checks for tunnelling.
+
+  python bench_physics.py --games 1000 --steps 1000
+"""
+import argparse
+import random
+import time
+
+import physics
+
+
+def new_games(count, seed=1):
+    rng = random.Random(seed)
+    games = []
+    for _ in range(count):
+        game = physics.Game()
+        game.ball.y = rng.uniform(-200, 200)
+        game.ball.dx = rng.choice((1, -1))
+        game.ball.dy = rng.choice((1, -1))
+        games.append(game)
+    return games
+
+
+def run(games, steps, dt=1 / 120):
+    games = new_games(games)
+    start = time.perf_counter()
+    physics.step_games(games, dt, steps)
+    elapsed = time.perf_counter() - start
+    return {
+        'game_steps_per_second': len(games) * steps / elapsed,
+        'paddle_hits': sum(game.hits for game in games),
+        'points': sum(game.l_score + game.r_score for game in games),
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--steps', type=int, default=1000)
+    args = parser.parse_args()
+    for name, value in run(args.games, args.steps).items():
+        print(f'{name:>22}: {value:,.0f}')
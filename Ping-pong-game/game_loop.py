@@ -0,0 +1,67 @@
+import time
+from collections import deque
+
+
+def percentiles(values, points=(50, 95, 99)):
+    ordered = sorted(values)
+    if not ordered:
+        return {point: 0.0 for point in points}
+    return {point: ordered[min(len(ordered) - 1, round(point / 100 * (len(ordered) - 1)))]
+            for point in points}
+
+
+class FixedStepLoop:
+    """Runs the simulation in fixed steps and renders at its own rate.
+
+    Every frame the real elapsed time (perf_counter) is added to an
+    accumulator and the simulation is stepped until the accumulator is used
+    up, so the game speed does not depend on how long a frame took. Frames
+    are scheduled with Tk's ontimer against absolute deadlines, so the frame
+    rate does not drift and nothing blocks the event loop.
+    """
+
+    def __init__(self, screen, update, render, step=1 / 120, fps=60, max_frame=0.25):
+        self.screen = screen
+        self.update = update
+        self.render = render
+        self.step = step
+        self.frame = 1 / fps
+        # A long stall (window dragged, debugger) is not replayed in full
+        self.max_frame = max_frame
+        self.frame_times = deque(maxlen=10_000)
+        self.running = False
+
+    def start(self):
+        self.running = True
+        self._accumulator = 0.0
+        self._previous = time.perf_counter()
+        self._deadline = self._previous + self.frame
+        self.screen.ontimer(self._tick, int(self.frame * 1000))
+
+    def stop(self):
+        self.running = False
+
+    def _tick(self):
+        if not self.running:
+            return
+        now = time.perf_counter()
+        frame_time = now - self._previous
+        self._previous = now
+        self.frame_times.append(frame_time)
+
+        self._accumulator += min(frame_time, self.max_frame)
+        while self._accumulator >= self.step:
+            self.update(self.step)
+            self._accumulator -= self.step
+        self.render()
+
+        # Next deadline on the fixed grid; skip the ones already missed
+        self._deadline += self.frame
+        now = time.perf_counter()
+        if self._deadline < now:
+            self._deadline = now + self.frame
+        self.screen.ontimer(self._tick, max(0, int((self._deadline - now) * 1000)))
+
+    def report(self):
+        times = percentiles(self.frame_times)
+        return {f'p{point}_ms': round(value * 1000, 2) for point, value in times.items()}
@@ -1,50 +1,64 @@
-import time
-from turtle import Screen, Turtle
-from paddle import Paddle
-from ball import Ball
-from scoreboard import Scoreboard
-
-screen = Screen()
-screen.bgcolor('black')
-screen.setup(width=800, height=600)
-screen.title('Pong')
-screen.tracer(0)
-
-r_paddle = Paddle((350, 0))
-l_paddle = Paddle((-350, 0))
-ball = Ball()
-scoreboard = Scoreboard()
-
-screen.listen()
-screen.onkey(r_paddle.go_up, 'Up')
-screen.onkey(r_paddle.go_down, 'Down')
-screen.onkey(l_paddle.go_up, 'w')
-screen.onkey(l_paddle.go_down, 's')
-
-game_is_on = True
-while game_is_on:
-    time.sleep(ball.move_speed)
-    screen.update()
-    ball.move()
-
-    # Detect collision with the wall
-    if ball.ycor() > 280 or ball.ycor() < -280:
-        # needs to bounce
-        ball.bounce_y()
-
-    # Detect collision with paddle
-    if ball.distance(r_paddle) < 50 and ball.xcor() > 320 or ball.distance(l_paddle) < 50 and ball.xcor() < -320:
-        ball.bounce_x()
-
-    # Detect R paddle misses
-    if ball.xcor() > 380:
-        ball.reset_position()
-        scoreboard.l_point()
-
-    # Detect L paddle misses
-    if ball.xcor() < -380:
-        ball.reset_position()
-        scoreboard.r_point()
-
-
-screen.exitonclick()
+import argparse
+from turtle import Screen
+from paddle import Paddle
+from ball import Ball
+from scoreboard import Scoreboard
+from game_loop import FixedStepLoop
+from ai import AIPlayer
+import physics
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--ai', action='store_true', help='the computer plays the left paddle')
+parser.add_argument('--ai-error', type=float, default=60.0, help='how far off the computer aims, in pixels')
+args = parser.parse_args()
+
+screen = Screen()
+screen.bgcolor('black')
+screen.setup(width=physics.WIDTH, height=physics.HEIGHT)
+screen.title('Pong')
+screen.tracer(0)
+canvas = screen.getcanvas()
+
+# The game runs in the physics module, the turtles only draw it
+game = physics.Game()
+r_paddle = Paddle(canvas, game.right)
+l_paddle = Paddle(canvas, game.left)
+ball = Ball(game.ball)
+scoreboard = Scoreboard(canvas)
+
+
+# A key only sets which way its paddle goes, the move happens in the step
+def bind_keys(paddle, up_key, down_key):
+    screen.onkeypress(lambda: paddle.hold(1), up_key)
+    screen.onkeyrelease(lambda: paddle.release(1), up_key)
+    screen.onkeypress(lambda: paddle.hold(-1), down_key)
+    screen.onkeyrelease(lambda: paddle.release(-1), down_key)
+
+
+screen.listen()
+bind_keys(game.right, 'Up', 'Down')
+if args.ai:
+    players = [AIPlayer(game, game.left, args.ai_error)]
+else:
+    players = []
+    bind_keys(game.left, 'w', 's')
+
+
+def update(dt):
+    for player in players:
+        player.control()
+    game.step(dt)
+
+
+def render():
+    ball.draw()
+    r_paddle.draw()
+    l_paddle.draw()
+    scoreboard.show(game.l_score, game.r_score)
+    screen.update()
+
+
+game_loop = FixedStepLoop(screen, update, render)
+game_loop.start()
+screen.exitonclick()
+print('Frame times:', game_loop.report())
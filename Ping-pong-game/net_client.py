@@ -0,0 +1,244 @@
+"""Pong client for the network server.
+
+  python net_client.py --host 127.0.0.1 --port 8765 --latency 100
+
+The own paddle is predicted: it moves as soon as a key is pressed, and every
+snapshot replays the inputs the server has not applied yet on top of the
+server's paddle. The ball and the other paddle are drawn a little in the
+past, interpolated between the two snapshots around that moment.
+"""
+import argparse
+import asyncio
+import threading
+import time
+from collections import deque
+
+import physics
+import protocol
+
+# How far in the past the ball and the other paddle are drawn: two snapshots
+INTERPOLATION_DELAY = 2 * protocol.SNAPSHOT_EVERY * protocol.STEP
+# Seconds start() waits for the server to accept the connection
+CONNECT_TIMEOUT = 10
+
+
+class NetworkClient:
+    """The connection to the server, run by asyncio in a thread of its own.
+
+    latency delays everything sent and received by half of it each way, to
+    try the game as it plays over a slow network.
+    """
+
+    def __init__(self, host, port, latency=0.0):
+        self.host = host
+        self.port = port
+        self.delay = latency / 2
+        self.side = None
+        self.ended = False
+        # (arrival time, snapshot), read by the game thread
+        self.snapshots = deque()
+        self.connected = threading.Event()
+        # Why the connection failed, raised by start()
+        self.error = None
+        self._loop = None
+        self._writer = None
+
+    def start(self):
+        threading.Thread(target=asyncio.run, args=(self._run(),), daemon=True).start()
+        if not self.connected.wait(CONNECT_TIMEOUT):
+            raise TimeoutError(f'no answer from {self.host}:{self.port}')
+        if self.error is not None:
+            raise self.error
+
+    async def _run(self):
+        self._loop = asyncio.get_running_loop()
+        try:
+            reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        except OSError as error:
+            self.error = error
+            return
+        finally:
+            self.connected.set()
+        decoder = protocol.SnapshotDecoder()
+        try:
+            while True:
+                message = await protocol.read_message(reader)
+                if self.delay:
+                    self._loop.call_later(self.delay, self._receive, decoder, message)
+                else:
+                    self._receive(decoder, message)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            self.ended = True
+
+    def _receive(self, decoder, message):
+        if message[0] == protocol.SNAPSHOT:
+            self.snapshots.append((time.monotonic(), decoder.decode(message)))
+        elif message[0] == protocol.HELLO:
+            self.side = protocol.decode_hello(message)
+        elif message[0] == protocol.END:
+            self.ended = True
+
+    def send_inputs(self, first_sequence, directions):
+        data = protocol.encode_input(first_sequence, directions)
+        if self.delay:
+            self._loop.call_soon_threadsafe(self._loop.call_later, self.delay, self._writer.write, data)
+        else:
+            self._loop.call_soon_threadsafe(self._writer.write, data)
+
+
+class Prediction:
+    """The own paddle, ahead of the server by the inputs still on their way."""
+
+    def __init__(self, paddle):
+        self.paddle = paddle
+        self.pending = deque()
+        self.next_sequence = 1
+        self.unsent = []
+        self.first_unsent = 1
+
+    def step(self, direction):
+        self.pending.append((self.next_sequence, direction))
+        if not self.unsent:
+            self.first_unsent = self.next_sequence
+        self.unsent.append(direction)
+        self.next_sequence += 1
+        protocol.move_paddle(self.paddle, direction)
+
+    def flush(self, client):
+        # All inputs of a frame go out in one message
+        while self.unsent:
+            batch = self.unsent[:protocol.MAX_INPUTS]
+            client.send_inputs(self.first_unsent, batch)
+            self.first_unsent += len(batch)
+            del self.unsent[:len(batch)]
+
+    def reconcile(self, server_y, ack):
+        while self.pending and self.pending[0][0] <= ack:
+            self.pending.popleft()
+        self.paddle.y = server_y
+        for _, direction in self.pending:
+            protocol.move_paddle(self.paddle, direction)
+
+
+class Interpolation:
+    """Snapshots on the server's clock, sampled INTERPOLATION_DELAY back."""
+
+    def __init__(self):
+        self.snapshots = deque(maxlen=32)
+        # Server time minus local time, smoothed over the snapshots
+        self.offset = None
+
+    def add(self, arrived, snapshot):
+        self.snapshots.append(snapshot)
+        offset = snapshot.tick * protocol.STEP - arrived
+        if self.offset is None:
+            self.offset = offset
+        else:
+            self.offset += (offset - self.offset) * 0.05
+
+    def sample(self, now):
+        """The snapshot pair around the render time and how far between them."""
+        snapshots = self.snapshots
+        if not snapshots:
+            return None, None, 0.0
+        tick = (now + self.offset - INTERPOLATION_DELAY) / protocol.STEP
+        if tick <= snapshots[0].tick:
+            return snapshots[0], snapshots[0], 0.0
+        for older, newer in zip(snapshots, list(snapshots)[1:]):
+            if older.tick <= tick < newer.tick:
+                return older, newer, (tick - older.tick) / (newer.tick - older.tick)
+        return snapshots[-1], snapshots[-1], 0.0
+
+
+def lerp(start, end, fraction):
+    return start + (end - start) * fraction
+
+
+def main():
+    from turtle import Screen
+
+    from ball import Ball
+    from game_loop import FixedStepLoop
+    from paddle import Paddle
+    from scoreboard import Scoreboard
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='added round trip time in ms')
+    args = parser.parse_args()
+
+    client = NetworkClient(args.host, args.port, args.latency / 1000)
+    client.start()
+
+    screen = Screen()
+    screen.bgcolor('black')
+    screen.setup(width=physics.WIDTH, height=physics.HEIGHT)
+    screen.title('Pong - waiting for an opponent')
+    screen.tracer(0)
+    canvas = screen.getcanvas()
+
+    # What is drawn: the snapshots copied into local state every frame
+    game = physics.Game()
+    paddles = (game.left, game.right)
+    views = [Paddle(canvas, game.left), Paddle(canvas, game.right)]
+    ball = Ball(game.ball)
+    scoreboard = Scoreboard(canvas)
+    keys = physics.PaddleState(0)
+    interpolation = Interpolation()
+    prediction = None
+
+    screen.listen()
+    for up_key, down_key in (('Up', 'Down'), ('w', 's')):
+        screen.onkeypress(lambda: keys.hold(1), up_key)
+        screen.onkeyrelease(lambda: keys.release(1), up_key)
+        screen.onkeypress(lambda: keys.hold(-1), down_key)
+        screen.onkeyrelease(lambda: keys.release(-1), down_key)
+
+    def update(dt):
+        if prediction is not None:
+            prediction.step(keys.direction)
+
+    def render():
+        nonlocal prediction
+        if prediction is None and client.side is not None:
+            prediction = Prediction(paddles[client.side])
+            screen.title('Pong - you play ' + ('left' if client.side == protocol.LEFT else 'right'))
+
+        newest = None
+        while client.snapshots:
+            arrived, newest = client.snapshots.popleft()
+            interpolation.add(arrived, newest)
+        if prediction is not None:
+            if newest is not None:
+                own_y = newest.left_y if client.side == protocol.LEFT else newest.right_y
+                prediction.reconcile(own_y, newest.ack)
+            prediction.flush(client)
+
+        older, newer, fraction = interpolation.sample(time.monotonic())
+        if older is not None:
+            # A point puts the ball back in the middle, which is no path to interpolate
+            if (older.l_score, older.r_score) != (newer.l_score, newer.r_score):
+                older = newer
+            game.ball.x = lerp(older.ball_x, newer.ball_x, fraction)
+            game.ball.y = lerp(older.ball_y, newer.ball_y, fraction)
+            if client.side != protocol.LEFT:
+                game.left.y = lerp(older.left_y, newer.left_y, fraction)
+            if client.side != protocol.RIGHT:
+                game.right.y = lerp(older.right_y, newer.right_y, fraction)
+            scoreboard.show(newer.l_score, newer.r_score)
+
+        ball.draw()
+        for view in views:
+            view.draw()
+        if client.ended:
+            screen.title('Pong - the game is over')
+        screen.update()
+
+    game_loop = FixedStepLoop(screen, update, render, step=protocol.STEP)
+    game_loop.start()
+    screen.exitonclick()
+
+
+if __name__ == '__main__':
+    main()
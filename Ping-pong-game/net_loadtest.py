@@ -0,0 +1,129 @@
+"""How many matches one server process hosts at the full tick rate.
+
+  python net_loadtest.py --levels 25 50 100 200 400 --seconds 5
+
+The server runs in a process of its own and prints its load every second.
+For every level this script connects two bot players per match, which send
+inputs at 20 Hz and count the snapshots they get, and reads the server's
+tick rate and CPU use. The test stops at the first level the server cannot
+keep up with.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+
+import protocol
+
+# Below this share of the tick rate the server counts as overloaded
+KEEP_UP = 0.95
+INPUT_INTERVAL = 0.05
+
+
+class Bot:
+    def __init__(self, seed):
+        self.random = random.Random(seed)
+        self.snapshots = 0
+        self.bytes = 0
+
+    async def play(self, host, port, stop):
+        reader, writer = await asyncio.open_connection(host, port)
+        sender = asyncio.create_task(self.send_inputs(writer))
+        try:
+            while not stop.is_set():
+                message = await protocol.read_message(reader)
+                if message[0] == protocol.SNAPSHOT:
+                    self.snapshots += 1
+                    self.bytes += len(message) + 1
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            sender.cancel()
+            writer.close()
+
+    async def send_inputs(self, writer):
+        sequence = 1
+        direction = 0
+        per_message = round(INPUT_INTERVAL / protocol.STEP)
+        while True:
+            directions = []
+            for _ in range(per_message):
+                if self.random.random() < 0.05:
+                    direction = self.random.choice((-1, 0, 1))
+                directions.append(direction)
+            writer.write(protocol.encode_input(sequence, directions))
+            sequence += per_message
+            await asyncio.sleep(INPUT_INTERVAL)
+
+
+async def read_stats(stdout, stats):
+    while line := await stdout.readline():
+        stats.append(json.loads(line))
+
+
+async def run_level(host, port, matches, seconds, stats):
+    stop = asyncio.Event()
+    bots = [Bot(seed) for seed in range(2 * matches)]
+    tasks = [asyncio.create_task(bot.play(host, port, stop)) for bot in bots]
+    # One second to connect and settle, then the measured seconds
+    await asyncio.sleep(1)
+    stats.clear()
+    before = sum(bot.snapshots for bot in bots)
+    sent_before = sum(bot.bytes for bot in bots)
+    await asyncio.sleep(seconds)
+    received = sum(bot.snapshots for bot in bots) - before
+    sent = sum(bot.bytes for bot in bots) - sent_before
+    measured = list(stats)
+    stop.set()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    # Let the server notice the closed connections before the next level
+    await asyncio.sleep(0.5)
+
+    expected = protocol.TICK_RATE / protocol.SNAPSHOT_EVERY
+    return {
+        'matches': matches,
+        'tick_rate': sum(line['tick_rate'] for line in measured) / max(1, len(measured)),
+        'server_cpu': sum(line['cpu'] for line in measured) / max(1, len(measured)),
+        'snapshot_rate': received / seconds / len(bots) / expected,
+        'bytes_per_snapshot': sent / max(1, received),
+    }
+
+
+async def main(levels, seconds, port):
+    # The server script lies next to this one, wherever it is run from
+    server_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'net_server.py')
+    server = await asyncio.create_subprocess_exec(
+        sys.executable, server_path, '--port', str(port), '--stats',
+        stdout=asyncio.subprocess.PIPE)
+    stats = []
+    reader = asyncio.create_task(read_stats(server.stdout, stats))
+    await asyncio.sleep(1)
+    best = 0
+    try:
+        for matches in levels:
+            result = await run_level('127.0.0.1', port, matches, seconds, stats)
+            print(f"{result['matches']:>6} matches: {result['tick_rate']:6.1f} ticks/s, "
+                  f"server cpu {result['server_cpu']:.0%}, "
+                  f"snapshots {result['snapshot_rate']:.0%} of {protocol.TICK_RATE // protocol.SNAPSHOT_EVERY}/s, "
+                  f"{result['bytes_per_snapshot']:.1f} bytes each", flush=True)
+            if result['tick_rate'] < KEEP_UP * protocol.TICK_RATE or result['snapshot_rate'] < KEEP_UP:
+                break
+            best = matches
+    finally:
+        server.terminate()
+        await server.wait()
+        reader.cancel()
+    print(f'One server process kept up with {best} matches')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--levels', type=int, nargs='+', default=[25, 50, 100, 200, 400, 800])
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--port', type=int, default=8766)
+    args = parser.parse_args()
+    asyncio.run(main(args.levels, args.seconds, args.port))
@@ -0,0 +1,175 @@
+"""Authoritative Pong server: pairs up clients and steps all matches.
+
+  python net_server.py --port 8765
+"""
+import argparse
+import asyncio
+import json
+import struct
+import time
+from collections import deque
+
+import physics
+import protocol
+
+# Inputs beyond this many waiting are from a client running ahead; drop them
+MAX_QUEUED_INPUTS = 30
+# A client that does not read its snapshots gets none until it catches up
+MAX_WRITE_BUFFER = 64 * 1024
+
+
+class Player:
+    def __init__(self, writer):
+        self.writer = writer
+        self.paddle = None
+        self.match = None
+        self.inputs = deque()
+        self.next_sequence = 0
+        self.ack = 0
+        self.encoder = protocol.SnapshotEncoder()
+
+    def receive(self, first_sequence, directions):
+        # Already received inputs are skipped, the rest queue up in order
+        skip = max(0, self.next_sequence - first_sequence)
+        for offset, direction in enumerate(directions[skip:], first_sequence + skip):
+            self.inputs.append((offset, direction))
+        self.next_sequence = max(self.next_sequence, first_sequence + len(directions))
+        while len(self.inputs) > MAX_QUEUED_INPUTS:
+            self.ack = self.inputs.popleft()[0]
+
+    def apply_input(self):
+        """Move the paddle by one step of input, if one has arrived.
+
+        A step of input always moves the paddle by one step, so the paddle
+        ends where the client predicted however late its inputs arrive.
+        """
+        if self.inputs:
+            self.ack, direction = self.inputs.popleft()
+            protocol.move_paddle(self.paddle, direction)
+            # A backlog is worked off two inputs per tick
+            if len(self.inputs) > protocol.SNAPSHOT_EVERY:
+                self.ack, direction = self.inputs.popleft()
+                protocol.move_paddle(self.paddle, direction)
+
+    def can_send(self):
+        return self.writer.transport.get_write_buffer_size() < MAX_WRITE_BUFFER
+
+    def send(self, data):
+        if self.can_send():
+            self.writer.write(data)
+
+
+class Match:
+    def __init__(self, left, right):
+        self.game = physics.Game()
+        self.players = (left, right)
+        for side, (player, paddle) in enumerate(zip(self.players, (self.game.left, self.game.right))):
+            player.paddle = paddle
+            player.match = self
+            player.send(protocol.encode_hello(side))
+
+    def send_snapshots(self, tick):
+        for player in self.players:
+            # A skipped snapshot is not encoded, so the next delta still fits
+            if player.can_send():
+                values = protocol.game_values(self.game, player.ack)
+                player.writer.write(player.encoder.encode(tick, values))
+
+
+class GameServer:
+    def __init__(self, report_stats=False):
+        self.report_stats = report_stats
+        self.waiting = None
+        self.matches = set()
+        self.tick = 0
+
+    async def handle_client(self, reader, writer):
+        player = Player(writer)
+        if self.waiting is None:
+            self.waiting = player
+        else:
+            self.matches.add(Match(self.waiting, player))
+            self.waiting = None
+        try:
+            while True:
+                message = await protocol.read_message(reader)
+                if not message:
+                    break
+                if message[0] == protocol.INPUT:
+                    player.receive(*protocol.decode_input(message))
+        # A malformed message ends the connection, like a closed socket
+        except (asyncio.IncompleteReadError, ConnectionError, struct.error, IndexError, ValueError):
+            pass
+        finally:
+            self.leave(player)
+            writer.close()
+
+    def leave(self, player):
+        if self.waiting is player:
+            self.waiting = None
+        match = player.match
+        if match in self.matches:
+            self.matches.discard(match)
+            for other in match.players:
+                if other is not player:
+                    other.send(protocol.encode_end())
+                    other.writer.close()
+
+    def step(self):
+        self.tick += 1
+        snapshot = self.tick % protocol.SNAPSHOT_EVERY == 0
+        for match in self.matches:
+            for player in match.players:
+                player.apply_input()
+            match.game.step(protocol.STEP)
+            if snapshot:
+                match.send_snapshots(self.tick)
+
+    async def run(self):
+        """Steps the matches on a fixed grid of deadlines."""
+        loop = asyncio.get_running_loop()
+        deadline = started = loop.time()
+        ticks = late = 0
+        cpu = time.process_time()
+        while True:
+            deadline += protocol.STEP
+            delay = deadline - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                late += 1
+                # Too far behind to catch up: drop the missed ticks
+                if delay < -0.25:
+                    deadline = loop.time()
+                await asyncio.sleep(0)
+            self.step()
+            ticks += 1
+
+            now = loop.time()
+            if self.report_stats and now - started >= 1:
+                used = time.process_time()
+                print(json.dumps({
+                    'matches': len(self.matches),
+                    'tick_rate': round(ticks / (now - started), 1),
+                    'late_ticks': late,
+                    'cpu': round((used - cpu) / (now - started), 3),
+                }), flush=True)
+                started = now
+                ticks = late = 0
+                cpu = used
+
+
+async def serve(host, port, report_stats=False):
+    game_server = GameServer(report_stats)
+    server = await asyncio.start_server(game_server.handle_client, host, port)
+    async with server:
+        await game_server.run()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--stats', action='store_true', help='print load figures every second')
+    args = parser.parse_args()
+    asyncio.run(serve(args.host, args.port, args.stats))
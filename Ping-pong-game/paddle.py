@@ -1,20 +1,22 @@
-from turtle import Turtle
-
-
-class Paddle(Turtle):
-    def __init__(self, position):
-        super().__init__()
-        self.shape('square')
-        self.color('white')
-        self.shapesize(stretch_wid=5, stretch_len=1)
-        self.penup()
-        self.goto(position)
-
-    def go_up(self):
-        new_y = self.ycor() + 20
-        self.goto(self.xcor(), new_y)
-
-    def go_down(self):
-        new_y = self.ycor() - 20
-        self.goto(self.xcor(), new_y)
-
+from physics import PADDLE_HALF_HEIGHT, PADDLE_HALF_WIDTH
+
+
+class Paddle:
+    """A rectangle on the turtle canvas, moved only when the paddle moved."""
+
+    def __init__(self, canvas, state):
+        self.canvas = canvas
+        self.state = state
+        self.item = canvas.create_rectangle(0, 0, 0, 0, fill='white', outline='white')
+        self.drawn_y = None
+        self.draw()
+
+    def draw(self):
+        if self.state.y == self.drawn_y:
+            return
+        self.drawn_y = self.state.y
+        # The canvas y axis points down, the turtle one up
+        x, y = self.state.x, -self.state.y
+        self.canvas.coords(self.item,
+                           x - PADDLE_HALF_WIDTH, y - PADDLE_HALF_HEIGHT,
+                           x + PADDLE_HALF_WIDTH, y + PADDLE_HALF_HEIGHT)
@@ -0,0 +1,147 @@
+"""Pong physics without a screen.
+
+The ball is a square of BALL_RADIUS half size and the paddles are boxes.
+Movement is swept: every step the ball's path is intersected with the walls
+and the paddle faces (expanded by the ball size), so the ball bounces at the
+exact point of contact however fast it flies and cannot tunnel through.
+"""
+from dataclasses import dataclass
+
+WIDTH = 800
+HEIGHT = 600
+BALL_RADIUS = 10
+WALL_Y = 290
+PADDLE_X = 350
+PADDLE_HALF_WIDTH = 10
+PADDLE_HALF_HEIGHT = 50
+# How fast a paddle moves while its key is held, pixels per second
+PADDLE_SPEED = 600
+# The ball has left the court behind a paddle
+OUT_X = 380
+
+# Pixels per second at the start of a rally
+START_SPEED = 100
+# Every paddle hit makes the ball faster, up to the cap
+SPEED_UP = 1.25
+MAX_SPEED = 1200
+
+# What happened in a step
+LEFT_POINT = 'left_point'
+RIGHT_POINT = 'right_point'
+PADDLE_HIT = 'paddle_hit'
+
+
+@dataclass
+class BallState:
+    x: float = 0.0
+    y: float = 0.0
+    # Direction of flight on each axis, 1 or -1
+    dx: int = 1
+    dy: int = 1
+    speed: float = START_SPEED
+
+    def reset(self):
+        self.x = self.y = 0.0
+        self.speed = START_SPEED
+        self.dx *= -1
+
+
+@dataclass
+class PaddleState:
+    x: float
+    y: float = 0.0
+    # 1 while the up key is held, -1 for down, 0 when the paddle rests
+    direction: int = 0
+
+    def move(self, distance):
+        limit = HEIGHT / 2 - PADDLE_HALF_HEIGHT
+        self.y = max(-limit, min(limit, self.y + distance))
+
+    def hold(self, direction):
+        self.direction = direction
+
+    def release(self, direction):
+        if self.direction == direction:
+            self.direction = 0
+
+
+class Game:
+    def __init__(self, max_speed=MAX_SPEED):
+        self.ball = BallState()
+        self.left = PaddleState(-PADDLE_X)
+        self.right = PaddleState(PADDLE_X)
+        self.max_speed = max_speed
+        self.l_score = 0
+        self.r_score = 0
+        self.hits = 0
+
+    def step(self, dt):
+        """Move the paddles and the ball for dt seconds, return the events of the step."""
+        for paddle in (self.left, self.right):
+            if paddle.direction:
+                paddle.move(paddle.direction * PADDLE_SPEED * dt)
+        events = []
+        ball = self.ball
+        remaining = dt
+        # A fast ball can bounce several times in one step
+        for _ in range(8):
+            if remaining <= 0:
+                break
+            vx = ball.dx * ball.speed
+            vy = ball.dy * ball.speed
+            hit_time, surface = self._first_hit(ball, vx, vy, remaining)
+            if surface is None:
+                ball.x += vx * remaining
+                ball.y += vy * remaining
+                break
+            ball.x += vx * hit_time
+            ball.y += vy * hit_time
+            remaining -= hit_time
+            if surface == 'wall':
+                ball.dy *= -1
+            else:
+                ball.dx *= -1
+                ball.speed = min(ball.speed * SPEED_UP, self.max_speed)
+                self.hits += 1
+                events.append(PADDLE_HIT)
+
+        if ball.x > OUT_X:
+            ball.reset()
+            self.l_score += 1
+            events.append(LEFT_POINT)
+        elif ball.x < -OUT_X:
+            ball.reset()
+            self.r_score += 1
+            events.append(RIGHT_POINT)
+        return events
+
+    def _first_hit(self, ball, vx, vy, remaining):
+        hit_time, surface = remaining, None
+
+        # Top and bottom walls
+        if vy > 0:
+            time_to_wall = (WALL_Y - BALL_RADIUS - ball.y) / vy
+        elif vy < 0:
+            time_to_wall = (-WALL_Y + BALL_RADIUS - ball.y) / vy
+        else:
+            time_to_wall = None
+        if time_to_wall is not None and 0 <= time_to_wall <= hit_time:
+            hit_time, surface = time_to_wall, 'wall'
+
+        # The face of the paddle the ball flies towards
+        paddle = self.right if vx > 0 else self.left
+        face = paddle.x - ball.dx * (PADDLE_HALF_WIDTH + BALL_RADIUS)
+        if vx and (face - ball.x) * ball.dx >= 0:
+            time_to_face = (face - ball.x) / vx
+            if time_to_face <= hit_time:
+                y = ball.y + vy * time_to_face
+                if abs(y - paddle.y) <= PADDLE_HALF_HEIGHT + BALL_RADIUS:
+                    hit_time, surface = time_to_face, 'paddle'
+        return hit_time, surface
+
+
+def step_games(games, dt, steps=1):
+    """Step many independent games, for self-play and benchmarks."""
+    for _ in range(steps):
+        for game in games:
+            game.step(dt)
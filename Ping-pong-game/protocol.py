@@ -0,0 +1,156 @@
+"""The binary protocol between the Pong server and its clients.
+
+Every message is one length byte followed by the payload, whose first byte
+is the message type. Snapshots are delta encoded: a bit mask says which
+fields changed since the last snapshot sent to that client, and only those
+fields follow. TCP delivers every snapshot in order, so the client always
+holds the state the delta is based on.
+"""
+import struct
+from collections import namedtuple
+
+import physics
+
+TICK_RATE = 120
+STEP = 1 / TICK_RATE
+# Snapshots go out every SNAPSHOT_EVERY ticks, 30 times a second
+SNAPSHOT_EVERY = 4
+# Positions and the speed are sent in 1/SCALE pixels
+SCALE = 8
+
+HELLO = 1
+INPUT = 2
+SNAPSHOT = 3
+END = 4
+
+LEFT = 0
+RIGHT = 1
+
+# Field of the snapshot and its struct code, in the order of the mask bits
+FIELDS = (
+    ('ball_x', 'h'),
+    ('ball_y', 'h'),
+    ('ball_direction', 'B'),
+    ('ball_speed', 'H'),
+    ('left_y', 'h'),
+    ('right_y', 'h'),
+    ('l_score', 'H'),
+    ('r_score', 'H'),
+    # The sequence number of the last input of this client the server applied
+    ('ack', 'I'),
+)
+SNAPSHOT_HEADER = struct.Struct('!BIH')
+INPUT_HEADER = struct.Struct('!BI')
+HELLO_MESSAGE = struct.Struct('!BB')
+# At most this many inputs fit in one message
+MAX_INPUTS = 250
+
+Snapshot = namedtuple('Snapshot', 'tick ball_x ball_y ball_dx ball_dy ball_speed left_y right_y l_score r_score ack')
+
+_structs = {}
+
+
+# One Struct per combination of changed fields, built on first use
+def _fields_struct(mask):
+    fields = _structs.get(mask)
+    if fields is None:
+        codes = ''.join(code for bit, (_, code) in enumerate(FIELDS) if mask & 1 << bit)
+        fields = _structs[mask] = struct.Struct('!' + codes)
+    return fields
+
+
+def frame(payload):
+    return bytes((len(payload),)) + payload
+
+
+async def read_message(reader):
+    size = (await reader.readexactly(1))[0]
+    return await reader.readexactly(size)
+
+
+def encode_hello(side):
+    return frame(HELLO_MESSAGE.pack(HELLO, side))
+
+
+def decode_hello(payload):
+    return HELLO_MESSAGE.unpack(payload)[1]
+
+
+def encode_end():
+    return frame(bytes((END,)))
+
+
+def encode_input(first_sequence, directions):
+    """Directions are -1, 0 or 1, one for every simulation step."""
+    return frame(INPUT_HEADER.pack(INPUT, first_sequence) + bytes(direction & 0xFF for direction in directions))
+
+
+def decode_input(payload):
+    """ValueError if the payload is not a well-formed input message."""
+    if len(payload) < INPUT_HEADER.size or payload[0] != INPUT:
+        raise ValueError('not an input message')
+    first_sequence = INPUT_HEADER.unpack_from(payload)[1]
+    directions = struct.unpack_from(f'{len(payload) - INPUT_HEADER.size}b', payload, INPUT_HEADER.size)
+    if directions and (min(directions) < -1 or max(directions) > 1):
+        raise ValueError('direction out of range')
+    return first_sequence, directions
+
+
+def game_values(game, ack):
+    ball = game.ball
+    return (
+        round(ball.x * SCALE),
+        round(ball.y * SCALE),
+        (ball.dx > 0) | (ball.dy > 0) << 1,
+        round(ball.speed * SCALE),
+        round(game.left.y * SCALE),
+        round(game.right.y * SCALE),
+        game.l_score,
+        game.r_score,
+        ack,
+    )
+
+
+class SnapshotEncoder:
+    """Encodes the snapshots of one client against the last one it was sent."""
+
+    def __init__(self):
+        self.last = None
+
+    def encode(self, tick, values):
+        last = self.last
+        if last is None:
+            mask = (1 << len(FIELDS)) - 1
+            changed = values
+        else:
+            mask = 0
+            changed = []
+            for bit, value in enumerate(values):
+                if value != last[bit]:
+                    mask |= 1 << bit
+                    changed.append(value)
+        self.last = values
+        return frame(SNAPSHOT_HEADER.pack(SNAPSHOT, tick, mask) + _fields_struct(mask).pack(*changed))
+
+
+class SnapshotDecoder:
+    def __init__(self):
+        self.values = [0] * len(FIELDS)
+
+    def decode(self, payload):
+        _, tick, mask = SNAPSHOT_HEADER.unpack_from(payload)
+        changed = iter(_fields_struct(mask).unpack_from(payload, SNAPSHOT_HEADER.size))
+        values = self.values
+        for bit in range(len(FIELDS)):
+            if mask & 1 << bit:
+                values[bit] = next(changed)
+        ball_x, ball_y, direction, speed, left_y, right_y, l_score, r_score, ack = values
+        return Snapshot(tick, ball_x / SCALE, ball_y / SCALE,
+                        1 if direction & 1 else -1, 1 if direction & 2 else -1, speed / SCALE,
+                        left_y / SCALE, right_y / SCALE, l_score, r_score, ack)
+
+
+def move_paddle(paddle, direction):
+    """One step of a paddle on the network, the same on server and client."""
+    if direction:
+        paddle.move(direction * physics.PADDLE_SPEED * STEP)
@@ -1,31 +1,26 @@
-from turtle import Turtle
-
-
-class Scoreboard(Turtle):
-    def __init__(self):
-        super().__init__()
-        self.color('white')
-        self.penup()
-        self.hideturtle()
-        self.l_score = 0
-        self.r_score = 0
-
-        self.update_scoreboard()
-
-    def update_scoreboard(self):
-        self.clear()
-        self.goto(-150, 200)
-        self.write('Score:', align='center', font=('Courier', 50, 'normal'))
-        self.goto(0, 200)
-
-        self.write(self.l_score, align='center', font=('Courier', 50, 'normal'))
-        self.goto(100, 200)
-        self.write(self.r_score, align='center', font=('Courier', 50, 'normal'))
-
-    def l_point(self):
-        self.l_score += 1
-        self.update_scoreboard()
-
-    def r_point(self):
-        self.r_score += 1
-        self.update_scoreboard()
+FONT = ('Courier', 50, 'normal')
+
+
+class Scoreboard:
+    """The score as three text items on the turtle canvas.
+
+    The items are created once; a score item is only reconfigured when the
+    score it shows changed.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.l_score = 0
+        self.r_score = 0
+        # Anchored at the bottom centre like turtle.write(align='center')
+        canvas.create_text(-150, -200, text='Score:', anchor='s', font=FONT, fill='white')
+        self.l_item = canvas.create_text(0, -200, text='0', anchor='s', font=FONT, fill='white')
+        self.r_item = canvas.create_text(100, -200, text='0', anchor='s', font=FONT, fill='white')
+
+    def show(self, l_score, r_score):
+        if l_score != self.l_score:
+            self.l_score = l_score
+            self.canvas.itemconfig(self.l_item, text=str(l_score))
+        if r_score != self.r_score:
+            self.r_score = r_score
+            self.canvas.itemconfig(self.r_item, text=str(r_score))
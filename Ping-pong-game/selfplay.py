@@ -0,0 +1,89 @@
+"""Headless AI against AI matches on a process pool, faster than real time.
+
+  python selfplay.py --matches 200 --left-error 40 --right-error 80
+"""
+import argparse
+import multiprocessing
+import time
+
+import physics
+from ai import AIPlayer
+from game_loop import percentiles
+
+STEP = 1 / 120
+
+
+def play_match(seed, left_error, right_error, points=11, max_seconds=3600):
+    """One match to points, returns the winner and the hits of every rally."""
+    game = physics.Game()
+    players = [AIPlayer(game, game.left, left_error, seed=seed * 2),
+               AIPlayer(game, game.right, right_error, seed=seed * 2 + 1)]
+    rallies = []
+    hits = 0
+    steps = 0
+    # A perfect pair could rally forever, so the match has a time limit
+    max_steps = int(max_seconds / STEP)
+    while max(game.l_score, game.r_score) < points and steps < max_steps:
+        for player in players:
+            player.control()
+        for event in game.step(STEP):
+            if event == physics.PADDLE_HIT:
+                hits += 1
+            else:
+                rallies.append(hits)
+                hits = 0
+        steps += 1
+
+    # A match stopped by the time limit has no winner, whatever the score
+    if game.l_score >= points:
+        winner = 'left'
+    elif game.r_score >= points:
+        winner = 'right'
+    else:
+        winner = None
+    return {'winner': winner, 'rallies': rallies, 'seconds': steps * STEP}
+
+
+def _play(arguments):
+    return play_match(*arguments)
+
+
+def run(matches, left_error, right_error, points=11, workers=None):
+    jobs = [(seed, left_error, right_error, points) for seed in range(matches)]
+    start = time.perf_counter()
+    with multiprocessing.Pool(workers) as pool:
+        results = list(pool.imap_unordered(_play, jobs, chunksize=max(1, matches // 64)))
+    elapsed = time.perf_counter() - start
+
+    rallies = [hits for result in results for hits in result['rallies']]
+    game_seconds = sum(result['seconds'] for result in results)
+    rally_points = percentiles(rallies)
+    # No matches give rates of 0 rather than a division by zero
+    played = max(matches, 1)
+    return {
+        'matches': matches,
+        'left_win_rate': sum(result['winner'] == 'left' for result in results) / played,
+        'right_win_rate': sum(result['winner'] == 'right' for result in results) / played,
+        'unfinished': sum(result['winner'] is None for result in results),
+        'points': len(rallies),
+        'mean_rally_hits': sum(rallies) / len(rallies) if rallies else 0.0,
+        'p50_rally_hits': rally_points[50],
+        'p95_rally_hits': rally_points[95],
+        'max_rally_hits': max(rallies, default=0),
+        'game_seconds': round(game_seconds),
+        'wall_seconds': round(elapsed, 2),
+        'speedup': round(game_seconds / elapsed),
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--matches', type=int, default=100)
+    parser.add_argument('--points', type=int, default=11)
+    parser.add_argument('--left-error', type=float, default=40.0)
+    parser.add_argument('--right-error', type=float, default=80.0)
+    parser.add_argument('--workers', type=int, default=None, help='default: one per core')
+    args = parser.parse_args()
+    stats = run(args.matches, args.left_error, args.right_error, args.points, args.workers)
+    for name, value in stats.items():
+        print(f'{name:>16}: {value:,.3f}' if isinstance(value, float) else f'{name:>16}: {value}')
@@ -0,0 +1,45 @@
+"""The ball never tunnels through a paddle or a wall, however fast it moves.
+
+  python -m pytest test_physics.py
+"""
+import pytest
+
+import physics
+
+
+# At these speeds one step carries the ball far past the paddle, so a collision test on
+# positions alone would miss it; the swept test has to bounce it back
+@pytest.mark.parametrize('speed', (1_000, 10_000, 100_000, 1_000_000))
+@pytest.mark.parametrize('dt', (1 / 120, 1 / 30, 0.25))
+@pytest.mark.parametrize('side', (1, -1))
+def test_paddle_bounces_fast_ball(speed, dt, side):
+    game = physics.Game(max_speed=speed)
+    game.ball.x = -side * 200
+    game.ball.y = 0
+    game.ball.dx = side
+    game.ball.dy = 0
+    game.ball.speed = speed
+    # Step until the ball has had time to reach the paddle
+    events = []
+    while physics.PADDLE_HIT not in events and game.ball.dx == side:
+        events = game.step(dt)
+        assert physics.RIGHT_POINT not in events and physics.LEFT_POINT not in events
+        assert abs(game.ball.x) <= physics.PADDLE_X - physics.PADDLE_HALF_WIDTH
+    assert physics.PADDLE_HIT in events
+
+
+def test_ball_passes_paddle_end():
+    game = physics.Game()
+    game.ball.y = physics.PADDLE_HALF_HEIGHT + physics.BALL_RADIUS + 1
+    game.ball.dy = 0
+    game.ball.speed = 100_000
+    assert physics.LEFT_POINT in game.step(1 / 120)
+
+
+def test_walls_hold_fast_ball():
+    game = physics.Game(max_speed=1_000_000)
+    game.right.y = physics.WALL_Y
+    game.ball.speed = 1_000_000
+    for _ in range(100):
+        game.step(1 / 120)
+        assert abs(game.ball.y) <= physics.WALL_Y - physics.BALL_RADIUS + 1e-6
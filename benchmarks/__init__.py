@@ -0,0 +1,11 @@
+"""Benchmarks of the hot paths of every project, run without a display.
+
+  python -m benchmarks                      all harnesses, results saved as JSON
+  python -m benchmarks pong nato --quick    some harnesses on smaller inputs
+  python -m benchmarks --profile            with cProfile, .prof files next to the results
+  python -m benchmarks --trace-memory       with the tracemalloc peak of each harness
+  python -m benchmarks --compare OLD NEW    changes between two result files
+
+Every harness runs in a fresh interpreter inside its project folder, because
+the projects are folders of flat modules that share names like main.py.
+"""
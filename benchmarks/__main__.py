@@ -0,0 +1,28 @@
+import argparse
+import sys
+
+from benchmarks import runner
+
+parser = argparse.ArgumentParser(prog='python -m benchmarks')
+parser.add_argument('harnesses', nargs='*',
+                    help=f"some of {', '.join(runner.HARNESSES)}; default: all of them")
+parser.add_argument('--quick', action='store_true', help='smaller inputs, for a fast check')
+parser.add_argument('--profile', action='store_true', help='run every harness under cProfile')
+parser.add_argument('--trace-memory', action='store_true', help='record the tracemalloc peak')
+parser.add_argument('--repeat', type=int, default=runner.REPEAT,
+                    help='runs of every harness, the median is kept (default: %(default)s)')
+parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='compare two result files')
+parser.add_argument('--threshold', type=float, default=runner.THRESHOLD,
+                    help='relative change that counts as a regression (default: %(default)s)')
+args = parser.parse_args()
+unknown = set(args.harnesses) - set(runner.HARNESSES)
+if unknown:
+    parser.error(f"unknown harnesses: {', '.join(sorted(unknown))}")
+
+if args.compare:
+    # A non-zero exit status lets a script fail on a regression
+    sys.exit(1 if runner.compare(*args.compare, args.threshold) else 0)
+if args.repeat < 1:
+    parser.error('--repeat must be at least 1')
+runner.run(args.harnesses or list(runner.HARNESSES), args.quick, args.profile, args.trace_memory,
+           args.repeat)
@@ -0,0 +1,87 @@
+"""Bot round handling in Card-guess-bot: the game alone, and behind a TeleBot
+whose send_message is stubbed out, so no request leaves the process."""
+import asyncio
+import time
+
+from benchmarks.runner import HIGHER, Metric
+
+# Rates high enough that the outbox never waits for a token
+NO_LIMITS = {'global_rate': 1e9, 'per_chat_rate': 1e9}
+
+METRICS = {
+    'game_messages_per_second': Metric(HIGHER, 0.15),
+    'telebot_messages_per_second': Metric(HIGHER, 0.15),
+    'cards_card_engine_per_second': Metric(HIGHER, 0.15),
+    'cards_card_engine_with_stats_per_second': Metric(HIGHER, 0.15),
+    'cards_stats_queries_per_second': Metric(HIGHER, 0.15),
+}
+
+
+def script(rounds):
+    lines = ['/start']
+    for round_number in range(rounds):
+        lines += ['Easy', '🟥' if round_number % 2 else '⬛️']
+    return lines
+
+
+def run_game(rounds, chats):
+    import game
+    from sessions import SessionStore
+
+    store = SessionStore()
+    lines = script(rounds)
+    start = time.perf_counter()
+    for chat_id in range(1, chats + 1):
+        for text in lines:
+            session = store.load(chat_id)
+            game.handle(session, text)
+            store.put(session)
+    return chats * len(lines) / (time.perf_counter() - start)
+
+
+def run_telebot(rounds, chats):
+    import telebot
+
+    import main
+    from sessions import SessionStore
+
+    bot = main.create_bot('123456:benchmark', SessionStore(), **NO_LIMITS)
+    # Handlers run in the calling thread instead of the worker pool
+    bot.threaded = False
+    sent = []
+    bot.send_message = lambda chat_id, text, reply_markup=None, **kwargs: sent.append(chat_id)
+
+    updates = []
+    for chat_id in range(1, chats + 1):
+        for text in script(rounds):
+            update_id = len(updates) + 1
+            updates.append(telebot.types.Update.de_json({
+                'update_id': update_id,
+                'message': {
+                    'message_id': update_id,
+                    'date': 0,
+                    'chat': {'id': chat_id, 'type': 'private'},
+                    'from': {'id': chat_id, 'is_bot': False, 'first_name': 'Player'},
+                    'text': text,
+                },
+            }))
+    start = time.perf_counter()
+    for position in range(0, len(updates), 100):
+        bot.process_new_updates(updates[position:position + 100])
+    # Replies leave through the outbox of the bot, on an event loop of its own
+    asyncio.run_coroutine_threadsafe(bot.outbox.join(), bot.outbox_loop).result()
+    seconds = time.perf_counter() - start
+    return len(updates) / seconds, len(sent) / len(updates)
+
+
+def run(quick=False):
+    import bench_cards
+
+    rounds, chats = (20, 50) if quick else (50, 200)
+    result = {'game_messages_per_second': run_game(rounds, chats)}
+    # Every message of a chat is in before the outbox runs, so the replies of
+    # whole games merge; reported only, as no player sends without waiting
+    result['telebot_messages_per_second'], result['telebot_replies_per_message'] = run_telebot(rounds, chats)
+    result.update((f'cards_{name}_per_second', value)
+                  for name, value in bench_cards.run(100_000 if quick else 1_000_000).items())
+    return result
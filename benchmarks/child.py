@@ -0,0 +1,37 @@
+"""Runs one harness inside its project folder and prints the result as JSON.
+
+Started by the runner as `python -m benchmarks.child NAME`, with the project
+folder as the working directory, so the project's modules import as they do
+when the project runs.
+"""
+import argparse
+import contextlib
+import importlib
+import json
+import sys
+
+from benchmarks.profiling import instrument
+
+# Packages some projects need that may not be installed; a harness that misses
+# one is skipped, any other import error fails it
+OPTIONAL_PACKAGES = ('numpy', 'telebot', 'aiohttp')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('name')
+    parser.add_argument('--quick', action='store_true')
+    parser.add_argument('--profile')
+    parser.add_argument('--trace-memory', action='store_true')
+    args = parser.parse_args()
+
+    harness = importlib.import_module(f'benchmarks.{args.name}')
+    # Anything the project prints goes to stderr, stdout is for the result
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            result, extra = instrument(lambda: harness.run(args.quick), args.profile, args.trace_memory)
+            result.update(extra)
+        except ModuleNotFoundError as error:
+            if (error.name or '').partition('.')[0] not in OPTIONAL_PACKAGES:
+                raise
+            result = {'skipped': str(error)}
+    print(json.dumps(result))
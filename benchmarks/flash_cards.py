@@ -0,0 +1,82 @@
+"""Deck loading and known-word persistence in flash-card-project.
+
+Works on a scaled-up copy of french_words.csv in a temporary folder, so the
+real progress files are never touched.
+"""
+import csv
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.runner import HIGHER, LOWER, Metric
+
+METRICS = {
+    'load_csv_ms': Metric(LOWER, 0.2),
+    'load_cache_cold_ms': Metric(LOWER, 0.2),
+    'load_cache_warm_ms': Metric(LOWER, 0.2),
+    'progress_open_ms': Metric(LOWER, 0.2),
+    # Every mark is fsynced, so the disk sets the noise
+    'mark_known_per_second': Metric(HIGHER, 0.25),
+    'progress_close_ms': Metric(LOWER, 0.2),
+    'progress_reopen_ms': Metric(LOWER, 0.2),
+}
+
+
+def scaled_deck(rows, data_dir):
+    with open(os.path.join('data', 'french_words.csv'), newline='', encoding='utf-8') as words_file:
+        reader = csv.reader(words_file)
+        header = next(reader)
+        words = [row for row in reader if row]
+    path = os.path.join(data_dir, 'french_words.csv')
+    with open(path, 'w', newline='', encoding='utf-8') as words_file:
+        writer = csv.writer(words_file)
+        writer.writerow(header)
+        for number in range(rows):
+            front, back = words[number % len(words)][:2]
+            # Fronts are the keys of the progress, so they must stay unique
+            writer.writerow([f'{front} {number}', back])
+    return path
+
+
+def milliseconds(function):
+    start = time.perf_counter()
+    result = function()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def run(quick=False):
+    from deck import load_deck
+    from decks import DeckRegistry
+    from progress import ProgressStore
+
+    def open_progress():
+        # The way the app opens a deck: the cached deck, its progress on top
+        deck = registry.load('french')
+        return ProgressStore(words_path, journal_path, deck,
+                             registry.load_progress('french', deck),
+                             lambda cards: registry.save_progress('french', cards))
+
+    rows = 10_000 if quick else 100_000
+    marks = 100 if quick else 500
+    data_dir = tempfile.mkdtemp()
+    try:
+        path = scaled_deck(rows, data_dir)
+        result = {'rows': rows}
+        result['load_csv_ms'], _ = milliseconds(lambda: load_deck(path))
+        registry = DeckRegistry(data_dir)
+        result['load_cache_cold_ms'], _ = milliseconds(lambda: registry.load('french'))
+        result['load_cache_warm_ms'], _ = milliseconds(lambda: registry.load('french'))
+
+        words_path, journal_path = registry.progress_paths('french')[:2]
+        shutil.copy(path, words_path)
+        result['progress_open_ms'], progress = milliseconds(open_progress)
+        # Every mark is fsynced, so this is mostly the speed of the disk
+        seconds, _ = milliseconds(lambda: [progress.mark_known(card) for card in range(marks)])
+        result['mark_known_per_second'] = marks / seconds * 1000
+        result['progress_close_ms'], _ = milliseconds(progress.close)
+        result['progress_reopen_ms'], progress = milliseconds(open_progress)
+        progress.close()
+        return result
+    finally:
+        shutil.rmtree(data_dir)
@@ -0,0 +1,24 @@
+"""Phonetic encoding and decoding, in NATO-alphabet-start."""
+from benchmarks.runner import HIGHER, Metric
+
+METRICS = {
+    'encode_encoder_per_word_mb_per_second': Metric(HIGHER, 0.2),
+    'encode_encoder_stream_mb_per_second': Metric(HIGHER, 0.25),
+    'decode_decoder_clean_mb_per_second': Metric(HIGHER, 0.2),
+    'decode_decoder_noisy_mb_per_second': Metric(HIGHER, 0.2),
+    # The share of lines decoded right does not depend on the machine
+    'decode_decoder_clean_lines_right': Metric(HIGHER, 0),
+    'decode_decoder_noisy_lines_right': Metric(HIGHER, 0),
+}
+
+
+def run(quick=False):
+    import benchmark
+
+    megabytes = 0.5 if quick else 4
+    result = {f'encode_{name}_mb_per_second': value
+              for name, value in benchmark.run_encode(megabytes).items()}
+    for name, (megabytes_per_second, right) in benchmark.run_decode(megabytes).items():
+        result[f'decode_{name}_mb_per_second'] = megabytes_per_second
+        result[f'decode_{name}_lines_right'] = right
+    return result
@@ -0,0 +1,67 @@
+"""Timer drift in pomodoro-project: how late a countdown ends when every wake
+costs time, for the deadline timers against the old one-second after() chain.
+
+A sleep stands in for the Tk callbacks and redraws that a busy event loop
+runs between two wakes.
+"""
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.runner import LOWER, Metric
+
+# Time taken by every wake, from nothing to a slow redraw
+MAX_WAKE_COST = 0.02
+
+METRICS = {
+    # A timer ends only a millisecond or two late, so the sleep jitter of the
+    # machine can make that several times as much
+    'deadline_late_ms': Metric(LOWER, 3.0),
+    # A couple of wakes and redraws, where one more is half again as many
+    'deadline_wakes': Metric(LOWER, 0.5),
+    'deadline_redraws': Metric(LOWER, 0.5),
+}
+
+
+def old_chain(seconds, rng):
+    # count_down re-armed after(1000) once the tick's work was done
+    start = time.monotonic()
+    for _ in range(seconds):
+        time.sleep(rng.uniform(0, MAX_WAKE_COST))
+        time.sleep(1)
+    return time.monotonic() - start - seconds
+
+
+def deadline_timer(seconds, rng, state_path):
+    from timers import TimerEngine
+
+    engine = TimerEngine(state_path)
+    timer = engine.start('benchmark', seconds)
+    wakes = redraws = 0
+    shown = None
+    while engine.pop_finished('benchmark') is None:
+        wakes += 1
+        time.sleep(rng.uniform(0, MAX_WAKE_COST))
+        if timer.seconds_shown() != shown:
+            shown = timer.seconds_shown()
+            redraws += 1
+        time.sleep(timer.until_change() + 0.001)
+    return time.monotonic() - timer.ends_at, wakes, redraws
+
+
+def run(quick=False):
+    seconds = 2 if quick else 5
+    state_path = os.path.join(tempfile.mkdtemp(), 'timers.json')
+    try:
+        late, wakes, redraws = deadline_timer(seconds, random.Random(1), state_path)
+        return {
+            'countdown_seconds': seconds,
+            'old_chain_late_ms': old_chain(seconds, random.Random(1)) * 1000,
+            'deadline_late_ms': late * 1000,
+            'deadline_wakes': wakes,
+            'deadline_redraws': redraws,
+        }
+    finally:
+        os.remove(state_path)
+        os.rmdir(os.path.dirname(state_path))
@@ -0,0 +1,22 @@
+"""Pong physics stepping and self-play, in Ping-pong-game."""
+from benchmarks.runner import HIGHER, Metric
+
+METRICS = {
+    'game_steps_per_second': Metric(HIGHER, 0.15),
+    'selfplay_speedup': Metric(HIGHER, 0.15),
+}
+
+
+def run(quick=False):
+    import bench_physics
+    import selfplay
+
+    result = bench_physics.run(games=200 if quick else 1000, steps=200 if quick else 1000)
+    matches = 4 if quick else 20
+    # One worker, so the figure does not depend on the number of cores
+    stats = selfplay.run(matches, left_error=40.0, right_error=80.0, points=5, workers=1)
+    return {
+        'game_steps_per_second': result['game_steps_per_second'],
+        'selfplay_speedup': stats['speedup'],
+        'selfplay_mean_rally_hits': stats['mean_rally_hits'],
+    }
@@ -0,0 +1,39 @@
+import cProfile
+import io
+import pstats
+import sys
+import tracemalloc
+
+
+def instrument(function, profile_path=None, trace_memory=False):
+    """Calls function, optionally under cProfile and tracemalloc.
+
+    Returns the result and the extra figures: the peak of traced memory, and
+    with a profile the ten functions with the most cumulative time, which are
+    also printed to stderr. Both make the harness slower, so timings taken
+    with them are only comparable to timings taken the same way.
+    """
+    extra = {}
+    profiler = cProfile.Profile() if profile_path else None
+    if trace_memory:
+        tracemalloc.start()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        result = function()
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        if trace_memory:
+            extra['peak_memory_bytes'] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    if profiler is not None:
+        profiler.dump_stats(profile_path)
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).sort_stats('cumulative').print_stats(10)
+        print(report.getvalue(), file=sys.stderr)
+        stats = pstats.Stats(profiler).sort_stats('cumulative')
+        extra['top_functions'] = [
+            f'{filename}:{line}({name})' for filename, line, name in stats.fcn_list[:10]]
+    return result, extra
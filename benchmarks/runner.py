@@ -0,0 +1,184 @@
+import datetime
+import importlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from collections import namedtuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+# Harness module and the project folder it runs in
+HARNESSES = {
+    'card_bot': 'Card-guess-bot',
+    'flash_cards': 'flash-card-project',
+    'pong': 'Ping-pong-game',
+    'pomodoro': 'pomodoro-project',
+    'nato': os.path.join('NATO-alphabet-start', 'NATO-alphabet-start'),
+}
+
+# A harness declares the metrics it is judged on in METRICS: which way is
+# better, and the least change that is noise, as a fraction of the old value.
+# The spread measured over repeated runs can raise that floor on a noisy
+# machine. Other figures, such as settings and the old code the project is
+# measured against, are reported only.
+Metric = namedtuple('Metric', 'better noise')
+HIGHER = 'higher'
+LOWER = 'lower'
+# Relative changes smaller than this are noise on a shared machine
+THRESHOLD = 0.10
+# Every harness runs this many times; the median is kept
+REPEAT = 3
+# Added by the runner itself, with --trace-memory
+COMMON_METRICS = {'peak_memory_bytes': Metric(LOWER, THRESHOLD)}
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run_harness(name, quick=False, profile_path=None, trace_memory=False):
+    command = [sys.executable, '-m', 'benchmarks.child', name]
+    if quick:
+        command.append('--quick')
+    if profile_path:
+        command += ['--profile', profile_path]
+    if trace_memory:
+        command.append('--trace-memory')
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get('PYTHONPATH')])))
+    completed = subprocess.run(command, cwd=os.path.join(ROOT, HARNESSES[name]), env=env,
+                               stdout=subprocess.PIPE, text=True)
+    if completed.returncode != 0:
+        return {'failed': f'exit status {completed.returncode}'}
+    return json.loads(completed.stdout.splitlines()[-1])
+
+
+def repeat_harness(name, repeat, quick=False, profile_path=None, trace_memory=False):
+    """The median of every figure over repeat runs, and how far the runs spread.
+
+    The spread of a figure is (max - min) / median. The first run that fails
+    or is skipped is returned as it is, with no spread.
+    """
+    runs = []
+    for number in range(repeat):
+        # One profile is enough
+        result = run_harness(name, quick, profile_path if number == 0 else None, trace_memory)
+        if 'failed' in result or 'skipped' in result:
+            return result, {}
+        runs.append(result)
+    median, spread = {}, {}
+    for metric, value in runs[0].items():
+        values = [result.get(metric) for result in runs]
+        if isinstance(value, (int, float)) and all(isinstance(other, (int, float)) for other in values):
+            median[metric] = statistics.median(values)
+            if median[metric]:
+                spread[metric] = (max(values) - min(values)) / abs(median[metric])
+        else:
+            median[metric] = value
+    return median, spread
+
+
+def run(names, quick=False, profile=False, trace_memory=False, repeat=REPEAT):
+    commit = git_commit()
+    stamp = datetime.datetime.now(datetime.timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    results = {
+        'commit': commit,
+        'date': stamp,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'quick': quick,
+        'profiled': profile,
+        'trace_memory': trace_memory,
+        'repeat': repeat,
+        'results': {},
+        'spread': {},
+    }
+    for name in names:
+        print(f'{name}...', file=sys.stderr, flush=True)
+        profile_path = os.path.join(RESULTS_DIR, f'{stamp}-{commit}-{name}.prof') if profile else None
+        result, results['spread'][name] = repeat_harness(name, repeat, quick, profile_path,
+                                                         trace_memory)
+        results['results'][name] = result
+        for metric, value in result.items():
+            if isinstance(value, (int, float)):
+                print(f'  {metric:>48}: {value:,.2f}')
+            elif not isinstance(value, list):
+                print(f'  {metric:>48}: {value}')
+
+    path = os.path.join(RESULTS_DIR, f'{stamp}-{commit}.json')
+    with open(path, 'w', encoding='utf-8') as results_file:
+        json.dump(results, results_file, indent=2)
+    print(f'Results saved to {os.path.relpath(path)}')
+    return path
+
+
+def harness_metrics(name):
+    metrics = dict(COMMON_METRICS)
+    if name in HARNESSES:
+        metrics.update(importlib.import_module(f'benchmarks.{name}').METRICS)
+    return metrics
+
+
+def is_regression(metric, old_value, new_value, threshold, spread=0.0):
+    """Whether a declared metric got worse by more than its noise.
+
+    A timing has to move by more than its declared noise, the threshold and
+    the spread measured over the runs of both files, all relative to the old
+    value. A noise of 0 marks an exact figure, such as an accuracy, where any
+    change for the worse counts.
+    """
+    worse = new_value - old_value if metric.better == LOWER else old_value - new_value
+    if metric.noise == 0:
+        return worse > 0
+    return worse > max(metric.noise, threshold, spread) * abs(old_value)
+
+
+def compare(old_path, new_path, threshold=THRESHOLD):
+    """Prints every metric of both files; returns the number of regressions.
+
+    A harness that failed, was skipped or is missing in the new file counts as
+    a regression too.
+    """
+    with open(old_path, encoding='utf-8') as old_file, open(new_path, encoding='utf-8') as new_file:
+        old, new = json.load(old_file), json.load(new_file)
+    print(f"{old['commit']} -> {new['commit']}")
+    if (old['quick'], old['profiled'], old['trace_memory']) != (new['quick'], new['profiled'], new['trace_memory']):
+        print('Warning: the runs used different options, the timings are not comparable')
+    regressions = 0
+    for name in sorted(set(old['results']) | set(new['results'])):
+        print(name)
+        result = new['results'].get(name)
+        if result is None or 'failed' in result or 'skipped' in result:
+            regressions += 1
+            if result is None:
+                problem = 'missing'
+            elif 'failed' in result:
+                problem = f"failed: {result['failed']}"
+            else:
+                problem = f"skipped: {result['skipped']}"
+            print(f'  {problem}  REGRESSION')
+            continue
+        metrics = harness_metrics(name)
+        for metric, new_value in result.items():
+            old_value = old['results'].get(name, {}).get(metric)
+            if not isinstance(new_value, (int, float)) or not isinstance(old_value, (int, float)):
+                continue
+            change = (new_value - old_value) / old_value if old_value else 0.0
+            # Either median may be off by the spread of its runs; files saved
+            # before runs were repeated have no spread
+            spread = (old.get('spread', {}).get(name, {}).get(metric, 0.0)
+                      + new.get('spread', {}).get(name, {}).get(metric, 0.0))
+            worse = metric in metrics and is_regression(metrics[metric], old_value, new_value,
+                                                         threshold, spread)
+            regressions += worse
+            mark = '  REGRESSION' if worse else ''
+            print(f'  {metric:>48}: {old_value:12,.2f} -> {new_value:12,.2f} ({change:+.1%}){mark}')
+    return regressions
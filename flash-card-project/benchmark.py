@@ -0,0 +1,82 @@
+"""Startup time and memory of the deck loaders on french_words.csv scaled up.
+
+  python benchmark.py --rows 1000 100000 1000000
+
+Every measurement runs in a fresh interpreter, so the import time of the
+loader and the peak RSS are part of the result.
+"""
+import argparse
+import csv
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+LOADERS = {
+    'pandas': (
+        "import pandas\n"
+        "cards = pandas.read_csv(path).to_dict(orient='records')\n"
+    ),
+    'deck': (
+        "from deck import load_deck\n"
+        "cards = load_deck(path)\n"
+    ),
+}
+
+MEASURE = (
+    "import resource, sys, time\n"
+    "start = time.perf_counter()\n"
+    "path = sys.argv[1]\n"
+    "{loader}"
+    "seconds = time.perf_counter() - start\n"
+    "rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n"
+    "print(len(cards), seconds, rss)\n"
+)
+
+
+# french_words.csv repeated until it has the given number of rows
+def scaled_words(rows, directory):
+    with open('data/french_words.csv', newline='', encoding='utf-8') as words_file:
+        reader = csv.reader(words_file)
+        header = next(reader)
+        words = list(reader)
+    path = os.path.join(directory, f'words_{rows}.csv')
+    with open(path, 'w', newline='', encoding='utf-8') as scaled_file:
+        writer = csv.writer(scaled_file)
+        writer.writerow(header)
+        for row in range(rows):
+            french, english = words[row % len(words)]
+            copy = row // len(words)
+            writer.writerow([f'{french}{copy}' if copy else french, english])
+    return path
+
+
+def measure(loader, path):
+    code = MEASURE.format(loader=LOADERS[loader])
+    result = subprocess.run([sys.executable, '-c', code, path], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    if result.returncode:
+        return {'loader': loader, 'error': result.stderr.strip().splitlines()[-1]}
+    cards, seconds, rss = result.stdout.split()
+    return {
+        'loader': loader,
+        'rows': int(cards),
+        'startup_ms': round(float(seconds) * 1000, 1),
+        # ru_maxrss is in kilobytes on Linux
+        'peak_rss_mb': round(int(rss) / 1024, 1),
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, nargs='+', default=[101, 100_000, 1_000_000])
+    parser.add_argument('--loaders', nargs='+', choices=list(LOADERS), default=list(LOADERS))
+    args = parser.parse_args()
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in args.rows:
+            path = scaled_words(rows, directory)
+            for loader in args.loaders:
+                print(json.dumps(measure(loader, path)))
@@ -0,0 +1,45 @@
+import csv
+
+
+class Deck:
+    """Cards of a words file, stored column by column.
+
+    A card is its row number: fronts[card] is the word to learn and
+    backs[card] its translation. languages holds the two column names.
+    """
+
+    __slots__ = ('languages', 'fronts', 'backs')
+
+    def __init__(self, languages, fronts, backs):
+        self.languages = languages
+        self.fronts = fronts
+        self.backs = backs
+
+    def __len__(self):
+        return len(self.fronts)
+
+    def rows(self, cards=None):
+        if cards is None:
+            cards = range(len(self))
+        fronts, backs = self.fronts, self.backs
+        return ([fronts[card], backs[card]] for card in cards)
+
+    # pandas is only imported by the code that really needs a data frame
+    def to_dataframe(self):
+        import pandas
+        return pandas.DataFrame({self.languages[0]: self.fronts, self.languages[1]: self.backs})
+
+
+def load_deck(path):
+    with open(path, newline='', encoding='utf-8') as words_file:
+        reader = csv.reader(words_file)
+        languages = tuple(next(reader)[:2])
+        fronts = []
+        backs = []
+        add_front = fronts.append
+        add_back = backs.append
+        for row in reader:
+            if row:
+                add_front(row[0])
+                add_back(row[1])
+    return Deck(languages, fronts, backs)
@@ -0,0 +1,160 @@
+import glob
+import hashlib
+import json
+import os
+from array import array
+
+from deck import Deck, load_deck
+
+# The deck the app started with keeps its files directly in data/
+DEFAULT_DECK = 'french'
+CACHE_VERSION = 1
+# Words never contain it, so a column is stored as one joined string
+SEPARATOR = '\0'
+
+
+def file_stamp(path):
+    stat = os.stat(path)
+    return f'{stat.st_mtime_ns}:{stat.st_size}'
+
+
+def file_hash(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as source:
+        for block in iter(lambda: source.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class DeckRegistry:
+    """All decks of the data folder, each with a binary cache.
+
+    A deck is a CSV file with the word column first and the translation
+    second; the header names the two languages. The cache holds a JSON header
+    line and then both columns as joined UTF-8 strings, so loading it is two
+    reads and two splits instead of parsing CSV. It is rebuilt when the CSV
+    changes: a changed size or mtime makes the registry compare the hash.
+    Only the decks that are loaded are held in memory.
+
+    The progress of a deck is kept the same way: the numbers of the cards
+    left to learn are cached as an array next to the deck, for as long as
+    the words file and the deck cache are the ones it was written for.
+    """
+
+    def __init__(self, data_dir='data'):
+        self.data_dir = data_dir
+        self.cache_dir = os.path.join(data_dir, 'cache')
+        self.sources = {DEFAULT_DECK: os.path.join(data_dir, 'french_words.csv')}
+        for path in sorted(glob.glob(os.path.join(data_dir, 'decks', '*.csv'))):
+            self.sources[os.path.splitext(os.path.basename(path))[0]] = path
+
+    def names(self):
+        return list(self.sources)
+
+    # Where the progress of the deck is kept: words left, known words journal,
+    # review state and review journal
+    def progress_paths(self, name):
+        if name == DEFAULT_DECK:
+            folder = self.data_dir
+        else:
+            folder = os.path.join(self.data_dir, 'progress', name)
+            os.makedirs(folder, exist_ok=True)
+        return (os.path.join(folder, 'words_to_learn.csv'),
+                os.path.join(folder, 'known_words.log'),
+                os.path.join(folder, 'review_state.csv'),
+                os.path.join(folder, 'review_state.log'))
+
+    def load(self, name):
+        source = self.sources[name]
+        cache_path = os.path.join(self.cache_dir, name + '.deck')
+        stamp = file_stamp(source)
+
+        header = deck = None
+        if os.path.exists(cache_path):
+            header, deck = read_cache(cache_path)
+        if header is not None and header['stamp'] == stamp:
+            return deck
+        source_hash = file_hash(source)
+        if header is None or header['hash'] != source_hash:
+            deck = load_deck(source)
+        # Rebuilt, or only touched: either way the cache gets the new stamp
+        write_cache(cache_path, deck, stamp, source_hash)
+        return deck
+
+    # Cards of the loaded deck that are left to learn
+    def load_progress(self, name, deck):
+        words_path = self.progress_paths(name)[0]
+        if not os.path.exists(words_path):
+            return array('I', range(len(deck)))
+        cache_path = os.path.join(self.cache_dir, name + '.progress')
+        stamp = self._progress_stamp(name, words_path)
+        cards = read_progress_cache(cache_path, stamp)
+        if cards is None:
+            index = {word: card for card, word in enumerate(deck.fronts)}
+            cards = array('I', [index[word] for word in load_deck(words_path).fronts
+                                if word in index])
+            write_progress_cache(cache_path, cards, stamp)
+        return cards
+
+    # Called once the words file has been written with these cards
+    def save_progress(self, name, cards):
+        words_path = self.progress_paths(name)[0]
+        write_progress_cache(os.path.join(self.cache_dir, name + '.progress'), cards,
+                             self._progress_stamp(name, words_path))
+
+    def _progress_stamp(self, name, words_path):
+        deck_stamp = file_stamp(os.path.join(self.cache_dir, name + '.deck'))
+        return f'{file_stamp(words_path)}/{deck_stamp}'
+
+
+def read_cache(path):
+    with open(path, 'rb') as cache:
+        header = json.loads(cache.readline())
+        if header.get('version') != CACHE_VERSION:
+            return None, None
+        columns = []
+        for size in header['sizes']:
+            text = cache.read(size).decode('utf-8')
+            columns.append(text.split(SEPARATOR) if header['count'] else [])
+    return header, Deck(tuple(header['languages']), *columns)
+
+
+def write_cache(path, deck, stamp, source_hash):
+    columns = [SEPARATOR.join(column).encode('utf-8') for column in (deck.fronts, deck.backs)]
+    header = {
+        'version': CACHE_VERSION,
+        'stamp': stamp,
+        'hash': source_hash,
+        'languages': list(deck.languages),
+        'count': len(deck),
+        'sizes': [len(column) for column in columns],
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'wb') as cache:
+        cache.write(json.dumps(header).encode('utf-8') + b'\n')
+        for column in columns:
+            cache.write(column)
+    os.replace(temporary_path, path)
+
+
+def read_progress_cache(path, stamp):
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as cache:
+        header = json.loads(cache.readline())
+        if header.get('version') != CACHE_VERSION or header['stamp'] != stamp:
+            return None
+        cards = array('I')
+        cards.frombytes(cache.read())
+    return cards
+
+
+def write_progress_cache(path, cards, stamp):
+    header = {'version': CACHE_VERSION, 'stamp': stamp}
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'wb') as cache:
+        cache.write(json.dumps(header).encode('utf-8') + b'\n')
+        cache.write(cards.tobytes())
+    os.replace(temporary_path, path)
@@ -1,67 +1,90 @@
-import random
 from tkinter import *
-import pandas
+from decks import DEFAULT_DECK, DeckRegistry
+from progress import ProgressStore
+from scheduler import Scheduler
+from view import CardView, load_image
 
 BACKGROUND_COLOR = "#B1DDC6"
-current_card = {}
-to_learn = {}
+current_card = None
+deck = None
+progress = None
+scheduler = None
 
-try:
-    data = pandas.read_csv('data/words_to_learn.csv')
-except FileNotFoundError:
-    original_data = pandas.read_csv('data/french_words.csv')
-    to_learn = original_data.to_dict(orient='records')
-else:
-    to_learn = data.to_dict(orient='records')
+registry = DeckRegistry('data')
 
 
-def next_card():
-    global current_card, flip_timer
-    window.after_cancel(flip_timer)
-    current_card = random.choice(to_learn)
-    canvas.itemconfig(card_title, text='French', fill='black')
-    canvas.itemconfig(card_word, text=current_card['French'], fill='black')
-    canvas.itemconfig(card_background, image=card_front_img)
-    flip_timer = window.after(3000, func=flip_card)
+# Only the active deck is held in memory; its progress is applied on top
+def open_deck(name):
+    global deck, progress, scheduler
+    close_deck()
+    words_path, journal_path, state_path, review_path = registry.progress_paths(name)
+    deck = registry.load(name)
+    progress = ProgressStore(words_path, journal_path, deck, registry.load_progress(name, deck),
+                             lambda cards: registry.save_progress(name, cards))
+    scheduler = Scheduler(state_path, review_path, progress)
+
+
+def close_deck():
+    if scheduler is not None:
+        scheduler.close()
+        progress.close()
+
+
+def switch_deck(name):
+    open_deck(name)
+    next_card()
 
 
-def flip_card():
-    canvas.itemconfig(card_title, text='English', fill='white')
-    canvas.itemconfig(card_word, text=current_card['English'], fill='white')
-    canvas.itemconfig(card_background, image=card_back_img)
+def next_card():
+    global current_card
+    current_card = scheduler.next_card()
+    if current_card is None:
+        card_view.show(None)
+        return
+    front_language, back_language = deck.languages
+    card_view.show((front_language, deck.fronts[current_card], back_language, deck.backs[current_card]))
 
 
 def is_known():
-    to_learn.remove(current_card)
-    data = pandas.DataFrame(to_learn)
-    data.to_csv('data/words_to_learn.csv', index=False)
+    if current_card is None:
+        return
+    scheduler.answer(current_card, known=True)
+    next_card()
+
+
+def is_unknown():
+    if current_card is None:
+        return
+    scheduler.answer(current_card, known=False)
     next_card()
 
 
+def close_window():
+    close_deck()
+    window.destroy()
+
+
 window = Tk()
 window.title('Flashy')
 window.config(padx=50, pady=50, bg=BACKGROUND_COLOR)
+window.protocol('WM_DELETE_WINDOW', close_window)
 
-flip_timer = window.after(3000, func=flip_card)
+card_view = CardView(window, BACKGROUND_COLOR)
+card_view.canvas.grid(row=0, column=0, columnspan=2)
 
-canvas = Canvas(width=800, height=526)
-card_front_img = PhotoImage(file="images/card_front.png")
-card_back_img = PhotoImage(file="images/card_back.png")
-card_background = canvas.create_image(400, 263, image=card_front_img)
-card_title = canvas.create_text(400, 150, text='', font=('Arial', 40, 'italic'))
-card_word = canvas.create_text(400, 263, text='', font=('Arial', 60, 'bold'))
-
-canvas.config(bg=BACKGROUND_COLOR, highlightthickness=0)
-canvas.grid(row=0, column=0, columnspan=2)
-
-cross_image = PhotoImage(file="images/wrong.png")
-unknown_button = Button(image=cross_image, highlightthickness=0, command=next_card)
+cross_image = load_image("images/wrong.png")
+unknown_button = Button(image=cross_image, highlightthickness=0, command=is_unknown)
 unknown_button.grid(row=1, column=1)
-check_image = PhotoImage(file="images/right.png")
+check_image = load_image("images/right.png")
 known_button = Button(image=check_image, highlightthickness=0, command=is_known)
 known_button.grid(row=1, column=0)
 
+deck_name = StringVar(value=DEFAULT_DECK)
+deck_menu = OptionMenu(window, deck_name, *registry.names(), command=switch_deck)
+deck_menu.config(bg=BACKGROUND_COLOR, highlightthickness=0)
+deck_menu.grid(row=2, column=0, columnspan=2, pady=(20, 0))
+
+open_deck(DEFAULT_DECK)
 next_card()
 
 window.mainloop()
-
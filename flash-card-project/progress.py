@@ -0,0 +1,108 @@
+import csv
+import os
+import threading
+from array import array
+
+# Compact the words file in the background after this many known words
+COMPACT_EVERY = 200
+
+
+class ProgressStore:
+    """Words left to learn, with an append-only journal of known words.
+
+    Marking a word as known removes it from memory in O(1) and appends one
+    line to the journal. The words file is only rewritten on compaction, in
+    the background or on close, through a temporary file and an atomic rename.
+    After a crash the journal is replayed on top of the last words file.
+
+    cards are the cards of deck left to learn when the words file was last
+    written, all of them by default; on_compact gets the cards every time
+    the words file is written again.
+    """
+
+    def __init__(self, words_path, journal_path, deck, cards=None, on_compact=None):
+        self.words_path = words_path
+        self.journal_path = journal_path
+        self.deck = deck
+        self.on_compact = on_compact
+        # Numbers of the cards left to learn
+        self.cards = array('I', range(len(deck)) if cards is None else cards)
+        fronts = deck.fronts
+        self._index = {fronts[card]: position for position, card in enumerate(self.cards)}
+        # Known words since the last compaction, in journal order
+        self._known = []
+        self._lock = threading.Lock()
+        self._compactor = None
+
+        if os.path.exists(journal_path):
+            with open(journal_path, newline='', encoding='utf-8') as journal:
+                for row in csv.reader(journal):
+                    if row and self._remove(row[0]):
+                        self._known.append(row[0])
+        self._journal = open(journal_path, 'a', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._journal)
+
+    def __len__(self):
+        return len(self.cards)
+
+    # Swap the last card into the removed card's place
+    def _remove(self, word):
+        position = self._index.pop(word, None)
+        if position is None:
+            return False
+        last = self.cards.pop()
+        if position < len(self.cards):
+            self.cards[position] = last
+            self._index[self.deck.fronts[last]] = position
+        return True
+
+    def mark_known(self, card):
+        word = self.deck.fronts[card]
+        with self._lock:
+            if not self._remove(word):
+                return
+            self._writer.writerow([word])
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+            self._known.append(word)
+            if len(self._known) >= COMPACT_EVERY and self._compactor is None:
+                self._compactor = threading.Thread(target=self.compact, daemon=True)
+                self._compactor.start()
+
+    def compact(self):
+        with self._lock:
+            cards = array('I', self.cards)
+            compacted = len(self._known)
+
+        temporary_path = self.words_path + '.tmp'
+        with open(temporary_path, 'w', newline='', encoding='utf-8') as words_file:
+            writer = csv.writer(words_file)
+            writer.writerow(self.deck.languages)
+            writer.writerows(self.deck.rows(cards))
+            words_file.flush()
+            os.fsync(words_file.fileno())
+        os.replace(temporary_path, self.words_path)
+        if self.on_compact is not None:
+            self.on_compact(cards)
+
+        # Only the words known after the snapshot stay in the journal
+        with self._lock:
+            self._known = self._known[compacted:]
+            temporary_path = self.journal_path + '.tmp'
+            with open(temporary_path, 'w', newline='', encoding='utf-8') as journal:
+                csv.writer(journal).writerows([word] for word in self._known)
+                journal.flush()
+                os.fsync(journal.fileno())
+            self._journal.close()
+            os.replace(temporary_path, self.journal_path)
+            self._journal = open(self.journal_path, 'a', newline='', encoding='utf-8')
+            self._writer = csv.writer(self._journal)
+            self._compactor = None
+
+    def close(self):
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+        if self._known:
+            self.compact()
+        self._journal.close()
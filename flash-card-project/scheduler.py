@@ -0,0 +1,137 @@
+import csv
+import heapq
+import os
+import random
+import threading
+import time
+from array import array
+
+# Leitner boxes: how long a card rests in each box before it comes back, in
+# seconds. A wrong answer sends the card to the first box, a right answer
+# moves it one box up, and a right answer in the last box means it is learned.
+BOX_INTERVALS = [15, 60, 10 * 60, 60 * 60, 24 * 60 * 60, 4 * 24 * 60 * 60]
+NEW = -1
+# Compact the review state in the background after this many answers
+COMPACT_EVERY = 500
+
+
+class Scheduler:
+    """Picks the next card: cards due for review first, by due time, then new cards.
+
+    Reviewed cards wait in a heap keyed by due time, so a pick costs O(log n).
+    The box and the due time of every card live in two flat arrays. Like the
+    known words, every answer appends one line to a journal, and the state
+    file is only rewritten on compaction, in the background or on close.
+    """
+
+    def __init__(self, state_path, journal_path, progress):
+        self.state_path = state_path
+        self.journal_path = journal_path
+        self.progress = progress
+        deck = progress.deck
+        self.boxes = array('b', [NEW]) * len(deck)
+        self.due = array('d', [0.0]) * len(deck)
+        self._heap = []
+        # Answers since the last compaction, in journal order
+        self._answers = []
+        self._lock = threading.Lock()
+        self._compactor = None
+
+        # The journal is replayed on top of the last state file
+        cards = {word: card for card, word in enumerate(deck.fronts)}
+        for path in (state_path, journal_path):
+            if not os.path.exists(path):
+                continue
+            with open(path, newline='', encoding='utf-8') as state_file:
+                for row in csv.reader(state_file):
+                    card = cards.get(row[0]) if len(row) == 3 else None
+                    if card is not None:
+                        self.boxes[card] = int(row[1])
+                        self.due[card] = float(row[2])
+                        if path == journal_path:
+                            self._answers.append(row)
+        self._journal = open(journal_path, 'a', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._journal)
+
+        self._new = []
+        for card in progress.cards:
+            if self.boxes[card] == NEW:
+                self._new.append(card)
+            else:
+                self._heap.append((self.due[card], card))
+        random.shuffle(self._new)
+        heapq.heapify(self._heap)
+
+    def next_card(self):
+        heap = self._heap
+        while heap and not self._waiting(*heap[0]):
+            heapq.heappop(heap)
+        # While no review is due the learner gets new cards
+        if heap and (heap[0][0] <= time.time() or not self._new):
+            return heapq.heappop(heap)[1]
+        if self._new:
+            return self._new.pop()
+        return None
+
+    # Entries of learned cards are skipped when they reach the top
+    def _waiting(self, due, card):
+        return self.due[card] == due and self.boxes[card] != NEW
+
+    def answer(self, card, known):
+        box = max(self.boxes[card], 0) + 1 if known else 0
+        with self._lock:
+            if box == len(BOX_INTERVALS):
+                # A learned card leaves the review state
+                self.boxes[card] = NEW
+                self.progress.mark_known(card)
+            else:
+                self.boxes[card] = box
+                self.due[card] = time.time() + BOX_INTERVALS[box]
+                heapq.heappush(self._heap, (self.due[card], card))
+            row = [self.progress.deck.fronts[card], self.boxes[card], self.due[card]]
+            self._writer.writerow(row)
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+            self._answers.append(row)
+            if len(self._answers) >= COMPACT_EVERY and self._compactor is None:
+                self._compactor = threading.Thread(target=self.compact, daemon=True)
+                self._compactor.start()
+
+    def compact(self):
+        with self._lock:
+            boxes = array('b', self.boxes)
+            due = array('d', self.due)
+            compacted = len(self._answers)
+
+        fronts = self.progress.deck.fronts
+        temporary_path = self.state_path + '.tmp'
+        with open(temporary_path, 'w', newline='', encoding='utf-8') as state_file:
+            writer = csv.writer(state_file)
+            for card, box in enumerate(boxes):
+                if box != NEW:
+                    writer.writerow([fronts[card], box, due[card]])
+            state_file.flush()
+            os.fsync(state_file.fileno())
+        os.replace(temporary_path, self.state_path)
+
+        # Only the answers given after the snapshot stay in the journal
+        with self._lock:
+            self._answers = self._answers[compacted:]
+            temporary_path = self.journal_path + '.tmp'
+            with open(temporary_path, 'w', newline='', encoding='utf-8') as journal:
+                csv.writer(journal).writerows(self._answers)
+                journal.flush()
+                os.fsync(journal.fileno())
+            self._journal.close()
+            os.replace(temporary_path, self.journal_path)
+            self._journal = open(self.journal_path, 'a', newline='', encoding='utf-8')
+            self._writer = csv.writer(self._journal)
+            self._compactor = None
+
+    def close(self):
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+        if self._answers:
+            self.compact()
+        self._journal.close()
@@ -0,0 +1,100 @@
+import time
+from tkinter import Canvas, PhotoImage
+
+FLIP_DELAY_MS = 3000
+
+_images = {}
+
+
+# Every image file is decoded once and shared
+def load_image(path):
+    image = _images.get(path)
+    if image is None:
+        image = _images[path] = PhotoImage(file=path)
+    return image
+
+
+class CardView:
+    """The card canvas.
+
+    show() only records the state the card should have. The canvas is updated
+    once per Tk idle cycle, and only the items whose options changed are
+    touched, so fast clicks never queue up redraws. The card flips by itself
+    FLIP_DELAY_MS after the last card was shown.
+    """
+
+    def __init__(self, window, background_color):
+        self.window = window
+        self.canvas = Canvas(width=800, height=526)
+        self.images = {
+            'front': load_image('images/card_front.png'),
+            'back': load_image('images/card_back.png'),
+        }
+        self.background = self.canvas.create_image(400, 263, image=self.images['front'])
+        self.title = self.canvas.create_text(400, 150, text='', font=('Arial', 40, 'italic'))
+        self.word = self.canvas.create_text(400, 263, text='', font=('Arial', 60, 'bold'))
+        self.canvas.config(bg=background_color, highlightthickness=0)
+
+        # Options of the canvas items as they are drawn now
+        self._drawn = {self.background: {'image': self.images['front']}, self.title: {}, self.word: {}}
+        self._card = None
+        self._side = 'front'
+        self._redraw = None
+        self._flip_at = None
+        self._flip_timer = None
+
+    # card is (front title, front word, back title, back word)
+    def show(self, card):
+        self._card = card
+        self._side = 'front'
+        self._schedule_redraw()
+        if card is None:
+            self._flip_at = None
+            return
+        self._flip_at = time.monotonic() + FLIP_DELAY_MS / 1000
+        # One timer serves all cards, it is only armed when none is pending
+        if self._flip_timer is None:
+            self._flip_timer = self.window.after(FLIP_DELAY_MS, self._flip_when_due)
+
+    def flip(self):
+        if self._card is not None:
+            self._side = 'back'
+            self._schedule_redraw()
+
+    def _flip_when_due(self):
+        self._flip_timer = None
+        if self._flip_at is None:
+            return
+        left = self._flip_at - time.monotonic()
+        if left > 0:
+            self._flip_timer = self.window.after(int(left * 1000) + 1, self._flip_when_due)
+        else:
+            self._flip_at = None
+            self.flip()
+
+    def _schedule_redraw(self):
+        if self._redraw is None:
+            self._redraw = self.window.after_idle(self._draw)
+
+    def _draw(self):
+        self._redraw = None
+        if self._card is None:
+            self._configure(self.title, text='', fill='black')
+            self._configure(self.word, text='All words learned!', fill='black')
+            self._configure(self.background, image=self.images['front'])
+            return
+        front_title, front_word, back_title, back_word = self._card
+        if self._side == 'front':
+            self._configure(self.title, text=front_title, fill='black')
+            self._configure(self.word, text=front_word, fill='black')
+        else:
+            self._configure(self.title, text=back_title, fill='white')
+            self._configure(self.word, text=back_word, fill='white')
+        self._configure(self.background, image=self.images[self._side])
+
+    def _configure(self, item, **options):
+        drawn = self._drawn[item]
+        changed = {name: value for name, value in options.items() if drawn.get(name) != value}
+        if changed:
+            self.canvas.itemconfig(item, **changed)
+            drawn.update(changed)
@@ -0,0 +1,67 @@
+"""The Pomodoro timer in a terminal, on the same sessions and history as the window.
+
+  python cli.py run      count down sessions until Ctrl+C
+  python cli.py stats    focus minutes of the last days and the streak
+  python cli.py log      the last sessions
+  python cli.py reset    stop the running session
+"""
+import argparse
+import datetime
+import time
+
+from history import History
+from sessions import SessionEngine
+from timers import TimerEngine
+
+TITLES = {'work': 'Work', 'short_break': 'Break', 'long_break': 'Long break'}
+
+
+def run(engine):
+    if engine.timer is None:
+        engine.start()
+    try:
+        while True:
+            finished = engine.poll()
+            if finished is not None:
+                print(f'\n{TITLES[finished]} done')
+            timer = engine.timer
+            seconds = timer.seconds_shown()
+            print(f'\r{TITLES[engine.kind]:<10} {seconds // 60:2}:{seconds % 60:02d}  '
+                  f'{"✔" * engine.work_done}', end='', flush=True)
+            # Sleep to the next change of the shown second, not a fixed second
+            time.sleep(timer.until_change() + 0.001)
+    except KeyboardInterrupt:
+        print()
+
+
+def stats(history, days):
+    for day, minutes, sessions in history.daily(days):
+        print(f'{day:%a %d %b}  {minutes:5.0f} min  {"✔" * sessions}')
+    current, best = history.streak()
+    print(f'Streak: {current} days, best {best}')
+
+
+def log(history, count):
+    for kind, started, ended in history.recent(count):
+        start = datetime.datetime.fromtimestamp(started)
+        print(f'{start:%Y-%m-%d %H:%M}  {TITLES[kind]:<10} {(ended - started) / 60:3.0f} min')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('command', choices=['run', 'stats', 'log', 'reset'])
+    parser.add_argument('--days', type=int, default=7)
+    parser.add_argument('--count', type=int, default=10)
+    args = parser.parse_args()
+
+    history = History()
+    engine = SessionEngine(TimerEngine(), history)
+    if args.command == 'run':
+        run(engine)
+    elif args.command == 'stats':
+        stats(history, args.days)
+    elif args.command == 'log':
+        log(history, args.count)
+    else:
+        engine.reset()
+    history.close()
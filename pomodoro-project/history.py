@@ -0,0 +1,106 @@
+import datetime
+import sqlite3
+
+
+def local_day(timestamp):
+    return datetime.date.fromtimestamp(timestamp)
+
+
+class History:
+    """Every finished session in SQLite, with the statistics kept up to date.
+
+    Recording an interval also adds it to its day's row in the daily table and
+    moves the streak forward, in the same transaction. Queries read those
+    rows, so they cost the same however long the history grows.
+    """
+
+    def __init__(self, path='history.db'):
+        self._db = sqlite3.connect(path, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript('''
+            CREATE TABLE IF NOT EXISTS intervals (
+                id INTEGER PRIMARY KEY,
+                kind TEXT NOT NULL,
+                started REAL NOT NULL,
+                ended REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS daily (
+                day TEXT PRIMARY KEY,
+                focus_seconds REAL NOT NULL,
+                work_sessions INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS streak (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                last_day TEXT NOT NULL,
+                current INTEGER NOT NULL,
+                best INTEGER NOT NULL
+            );
+        ''')
+
+    def record(self, kind, started, ended):
+        with self._db:
+            self._db.execute('BEGIN')
+            self._db.execute('INSERT INTO intervals (kind, started, ended) VALUES (?, ?, ?)',
+                             (kind, started, ended))
+            if kind == 'work':
+                self._add_work(local_day(ended), ended - started)
+
+    def _add_work(self, day, seconds):
+        self._db.execute('''
+            INSERT INTO daily (day, focus_seconds, work_sessions) VALUES (?, ?, 1)
+            ON CONFLICT (day) DO UPDATE SET focus_seconds = focus_seconds + excluded.focus_seconds,
+                                            work_sessions = work_sessions + 1
+        ''', (day.isoformat(), seconds))
+
+        row = self._db.execute('SELECT last_day, current, best FROM streak').fetchone()
+        if row is None:
+            current = best = 1
+        else:
+            last_day = datetime.date.fromisoformat(row[0])
+            current, best = row[1], row[2]
+            if day <= last_day:
+                return
+            current = current + 1 if day - last_day == datetime.timedelta(days=1) else 1
+            best = max(best, current)
+        self._db.execute('INSERT OR REPLACE INTO streak VALUES (1, ?, ?, ?)',
+                         (day.isoformat(), current, best))
+
+    def focus_minutes(self, day=None):
+        day = day or datetime.date.today()
+        row = self._db.execute('SELECT focus_seconds FROM daily WHERE day = ?',
+                               (day.isoformat(),)).fetchone()
+        return row[0] / 60 if row else 0.0
+
+    def daily(self, days=7, today=None):
+        """(day, focus minutes, work sessions) for the last days, oldest first."""
+        today = today or datetime.date.today()
+        first = today - datetime.timedelta(days=days - 1)
+        rows = dict((day, (seconds, sessions)) for day, seconds, sessions in self._db.execute(
+            'SELECT day, focus_seconds, work_sessions FROM daily WHERE day >= ?', (first.isoformat(),)))
+        result = []
+        for offset in range(days):
+            day = first + datetime.timedelta(days=offset)
+            seconds, sessions = rows.get(day.isoformat(), (0.0, 0))
+            result.append((day, seconds / 60, sessions))
+        return result
+
+    def streak(self, today=None):
+        """(current, best) run of days with at least one work session.
+
+        Today without a session yet does not break the run, yesterday does.
+        """
+        today = today or datetime.date.today()
+        row = self._db.execute('SELECT last_day, current, best FROM streak').fetchone()
+        if row is None:
+            return 0, 0
+        last_day, current, best = datetime.date.fromisoformat(row[0]), row[1], row[2]
+        if (today - last_day).days > 1:
+            current = 0
+        return current, best
+
+    def recent(self, count=10):
+        return self._db.execute('SELECT kind, started, ended FROM intervals ORDER BY id DESC LIMIT ?',
+                                (count,)).fetchall()
+
+    def close(self):
+        self._db.close()
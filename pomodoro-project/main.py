@@ -1,67 +1,84 @@
-import math
 from tkinter import *
+
+from history import History
+from sessions import LONG_BREAK, SHORT_BREAK, SessionEngine
+from timers import TimerEngine
+
 # ---------------------------- CONSTANTS ------------------------------- #
 PINK = "#e2979c"
 RED = "#e7305b"
 GREEN = "#9bdeac"
 YELLOW = "#f7f5dd"
 FONT_NAME = "Courier"
-WORK_MIN = 25
-SHORT_BREAK_MIN = 5
-LONG_BREAK_MIN = 20
-reps = 0
-timer = None
+refresh_job = None
+shown_seconds = None
+history = History()
+engine = SessionEngine(TimerEngine(), history)
 
 # ---------------------------- TIMER RESET ------------------------------- #
 
 def reset_timer():
-    window.after_cancel(timer)
+    global shown_seconds
+    engine.reset()
+    cancel_refresh()
     canvas.itemconfig(timer_text, text='00:00')
-    title_label.config(text='Timer')
+    title_label.config(text='Timer', fg=GREEN)
     check_marks.config(text='')
-    global reps
-    reps = 0
+    shown_seconds = None
 
 # ---------------------------- TIMER MECHANISM ------------------------------- #
 
 def start_timer():
-    global reps
-    reps += 1
-    work_sec = WORK_MIN * 60
-    short_break_sec = SHORT_BREAK_MIN * 60
-    long_break_sec = LONG_BREAK_MIN * 60
-
-    if reps % 8 == 0:
-        count_down(long_break_sec)
-        title_label.config(text='Break', fg=RED)
+    engine.start()
+    show_session()
+    refresh()
+
 
-        # title_label = Label(text='Timer', fg=GREEN, bg=YELLOW, font=(FONT_NAME, 50))
-    elif reps % 2 == 0:
-        count_down(short_break_sec)
+def show_session():
+    if engine.kind == LONG_BREAK:
+        title_label.config(text='Break', fg=RED)
+    elif engine.kind == SHORT_BREAK:
         title_label.config(text='Break', fg=PINK)
     else:
-        count_down(work_sec)
         title_label.config(text='Work', fg=GREEN)
+    check_marks.config(text='✔' * engine.work_done)
+    show_stats()
+
+
+def show_stats():
+    current, best = history.streak()
+    stats_label.config(text=f'Today: {history.focus_minutes():.0f} min   Streak: {current} days (best {best})')
 
 # ---------------------------- COUNTDOWN MECHANISM ------------------------------- #
 
-def count_down(count):
-    count_min = math.floor(count / 60)
-    count_sec = count % 60
-    if count_sec < 10:
-        count_sec = f'0{count_sec}'
+# Wakes up only when the shown second changes; the time left comes from the
+# deadline, so a late wake-up never makes the session longer
+def refresh():
+    global shown_seconds
+    cancel_refresh()
+    if engine.poll() is not None:
+        show_session()
 
-    canvas.itemconfig(timer_text, text=f'{count_min}:{count_sec}')
-    if count > 0:
-        global timer
-        timer = window.after(1000, count_down, count - 1)
-    else:
-        start_timer()
-        marks = ''
-        work_sessions = math.floor(reps / 2)
-        for _ in range(work_sessions):
-            marks += '✔'
-        check_marks.config(text=marks)
+    timer = engine.timer
+    if timer is None:
+        return
+    seconds = timer.seconds_shown()
+    if seconds != shown_seconds:
+        shown_seconds = seconds
+        canvas.itemconfig(timer_text, text=f'{seconds // 60}:{seconds % 60:02d}')
+    schedule_refresh(timer.until_change())
+
+
+def schedule_refresh(delay):
+    global refresh_job
+    refresh_job = window.after(int(delay * 1000) + 1, refresh)
+
+
+def cancel_refresh():
+    global refresh_job
+    if refresh_job is not None:
+        window.after_cancel(refresh_job)
+        refresh_job = None
 
 # ---------------------------- UI SETUP ------------------------------- #
 window = Tk()
@@ -86,5 +103,14 @@ reset_button.grid(row=2, column=2)
 check_marks = Label(fg=GREEN, bg=YELLOW)
 check_marks.grid(row=3, column=1)
 
+stats_label = Label(fg=GREEN, bg=YELLOW, font=(FONT_NAME, 10))
+stats_label.grid(row=4, column=0, columnspan=3)
+
+show_stats()
+# A session that was running when the window closed goes on where it is now
+if engine.timer is not None:
+    show_session()
+    refresh()
 
 window.mainloop()
+history.close()
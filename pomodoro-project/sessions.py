@@ -0,0 +1,67 @@
+import time
+
+WORK = 'work'
+SHORT_BREAK = 'short_break'
+LONG_BREAK = 'long_break'
+
+WORK_MIN = 25
+SHORT_BREAK_MIN = 5
+LONG_BREAK_MIN = 20
+
+
+class SessionEngine:
+    """The Pomodoro order of work and breaks, without any UI.
+
+    A session is a timer of the TimerEngine, so it survives a restart. When
+    its timer runs out the session is written to the history and the next one
+    starts. The Tk window and the command line both drive this class.
+    """
+
+    def __init__(self, timers, history, name='pomodoro',
+                 work_min=WORK_MIN, short_break_min=SHORT_BREAK_MIN, long_break_min=LONG_BREAK_MIN):
+        self.timers = timers
+        self.history = history
+        self.name = name
+        self.durations = {WORK: work_min * 60, SHORT_BREAK: short_break_min * 60,
+                          LONG_BREAK: long_break_min * 60}
+        timer = timers.get(name)
+        self.reps = timer.data['reps'] if timer is not None else 0
+
+    @property
+    def timer(self):
+        return self.timers.get(self.name)
+
+    @property
+    def kind(self):
+        if self.reps == 0:
+            return None
+        if self.reps % 8 == 0:
+            return LONG_BREAK
+        if self.reps % 2 == 0:
+            return SHORT_BREAK
+        return WORK
+
+    @property
+    def work_done(self):
+        return self.reps // 2
+
+    def start(self):
+        self.reps += 1
+        self.timers.start(self.name, self.durations[self.kind],
+                          reps=self.reps, kind=self.kind, started=time.time())
+
+    def reset(self):
+        self.timers.cancel(self.name)
+        self.reps = 0
+
+    def poll(self):
+        """Records the session if it ran out and starts the next; returns the finished kind."""
+        finished = self.timers.pop_finished(self.name)
+        if finished is None:
+            return None
+        # The end is the deadline, even if nobody looked for a while
+        started = finished.data['started']
+        self.history.record(finished.data['kind'], started, started + finished.duration)
+        self.reps = finished.data['reps']
+        self.start()
+        return finished.data['kind']
@@ -0,0 +1,90 @@
+import json
+import math
+import os
+import time
+
+
+class Timer:
+    """A countdown to an absolute deadline on the time.monotonic clock.
+
+    The time left is always computed from the deadline, so a late wake-up
+    makes the display skip a second instead of making the timer run long.
+    """
+
+    def __init__(self, name, duration, ends_at, data=None):
+        self.name = name
+        self.duration = duration
+        self.ends_at = ends_at
+        # Whatever the owner wants back after a restart
+        self.data = data or {}
+
+    def remaining(self, now=None):
+        if now is None:
+            now = time.monotonic()
+        return max(0.0, self.ends_at - now)
+
+    def seconds_shown(self, now=None):
+        """Whole seconds left, rounded up: 25:00 stays on screen for the first second."""
+        return math.ceil(self.remaining(now))
+
+    def until_change(self, now=None):
+        """Seconds until seconds_shown() changes."""
+        remaining = self.remaining(now)
+        return remaining - (math.ceil(remaining) - 1) if remaining > 0 else 0.0
+
+
+class TimerEngine:
+    """Named timers of one process, saved to a JSON file so they survive a restart.
+
+    The file holds the wall clock time each timer ends at, because the
+    monotonic clock starts over with the process. It is only written when a
+    timer is started, finished or cancelled, never per tick.
+    """
+
+    def __init__(self, state_path='timers.json'):
+        self.state_path = state_path
+        self.timers = {}
+        if os.path.exists(state_path):
+            with open(state_path, encoding='utf-8') as state_file:
+                saved = json.load(state_file)
+            offset = time.monotonic() - time.time()
+            for entry in saved:
+                self.timers[entry['name']] = Timer(entry['name'], entry['duration'],
+                                                   entry['ends_at'] + offset, entry['data'])
+
+    def start(self, name, duration, **data):
+        timer = self.timers[name] = Timer(name, duration, time.monotonic() + duration, data)
+        self._save()
+        return timer
+
+    def get(self, name):
+        return self.timers.get(name)
+
+    def cancel(self, name):
+        if self.timers.pop(name, None) is not None:
+            self._save()
+
+    def pop_finished(self, name, now=None):
+        """Removes the timer name if it ran out and returns it, else None.
+
+        Other timers are left alone, so owners sharing one engine each take
+        only their own.
+        """
+        if now is None:
+            now = time.monotonic()
+        timer = self.timers.get(name)
+        if timer is None or timer.ends_at > now:
+            return None
+        del self.timers[name]
+        self._save()
+        return timer
+
+    def _save(self):
+        offset = time.time() - time.monotonic()
+        saved = [{'name': timer.name, 'duration': timer.duration,
+                  'ends_at': timer.ends_at + offset, 'data': timer.data}
+                 for timer in self.timers.values()]
+        temporary_path = self.state_path + '.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as state_file:
+            json.dump(saved, state_file)
+        os.replace(temporary_path, self.state_path)
@@ -1,41 +1,105 @@
-import pygame
-import random
-
-pygame.init()
-pygame.display.set_caption('Измени цвет фона')
-window_surface = pygame.display.set_mode((300, 300))
-background = pygame.Surface((300, 300))
-background.fill(pygame.Color('#000000'))
-
-color_list = [
-    pygame.Color('#FF0000'),  # красный
-    pygame.Color('#00FF00'),  # зеленый
-    pygame.Color('#0000FF'),  # синий
-    pygame.Color('#FFFF00'),  # желтый
-    pygame.Color('#00FFFF'),  # бирюзовый
-    pygame.Color('#FF00FF'),  # пурпурный
-    pygame.Color('#FFFFFF')   # белый
-]
-
-current_color_index = 0
-
-button_font = pygame.font.SysFont('Verdana', 15) # используем шрифт Verdana
-button_text_color = pygame.Color("black")
-button_color = pygame.Color("gray")
-button_rect = pygame.Rect(100, 115, 100, 50)
-button_text = button_font.render('Click me!', True, button_text_color)
-
-while True:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            pygame.quit()
-            exit()
-        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            if button_rect.collidepoint(event.pos):
-                background.fill(random.choice(color_list))
-
-        window_surface.blit(background, (0, 0))
-        pygame.draw.rect(window_surface, button_color, button_rect)
-        button_rect_center = button_text.get_rect(center=button_rect.center)
-        window_surface.blit(button_text, button_rect_center)
-        pygame.display.update()
+import argparse
+import random
+import time
+
+import pygame
+
+MAX_FPS = 60
+
+parser = argparse.ArgumentParser()
+# Замер: N секунд щелчков по кнопке раз в секунду, потом отчёт о кадрах и CPU
+parser.add_argument('--probe', type=float, metavar='SECONDS')
+args = parser.parse_args()
+
+pygame.init()
+pygame.display.set_caption('Измени цвет фона')
+window_surface = pygame.display.set_mode((300, 300))
+window_rect = window_surface.get_rect()
+background = pygame.Surface((300, 300))
+background.fill(pygame.Color('#000000'))
+
+color_list = [
+    pygame.Color('#FF0000'),  # красный
+    pygame.Color('#00FF00'),  # зеленый
+    pygame.Color('#0000FF'),  # синий
+    pygame.Color('#FFFF00'),  # желтый
+    pygame.Color('#00FFFF'),  # бирюзовый
+    pygame.Color('#FF00FF'),  # пурпурный
+    pygame.Color('#FFFFFF')   # белый
+]
+
+current_color_index = 0
+
+button_font = pygame.font.SysFont('Verdana', 15) # используем шрифт Verdana
+button_text_color = pygame.Color("black")
+button_color = pygame.Color("gray")
+button_rect = pygame.Rect(100, 115, 100, 50)
+button_text = button_font.render('Click me!', True, button_text_color)
+button_text_rect = button_text.get_rect(center=button_rect.center)  # считаем один раз
+
+
+def draw(area):
+    # Перерисовываем только область area: фон под ней и кнопку, если она задета
+    window_surface.blit(background, area, area)
+    if button_rect.colliderect(area):
+        pygame.draw.rect(window_surface, button_color, button_rect)
+        window_surface.blit(button_text, button_text_rect)
+
+
+def handle(event):
+    # Возвращает области окна, которые нужно перерисовать
+    if event.type == pygame.QUIT:
+        return None
+    if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+        if button_rect.collidepoint(event.pos):
+            background.fill(random.choice(color_list))
+            return [window_rect]  # новый фон - меняется всё окно
+    if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+        return [window_rect]
+    return []
+
+
+def percentile(values, point):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(point / 100 * (len(ordered) - 1)))] if ordered else 0.0
+
+
+clock = pygame.time.Clock()
+frame_times = []
+started = time.perf_counter()
+cpu_started = time.process_time()
+if args.probe:
+    click = pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=button_rect.center, button=1)
+    pygame.time.set_timer(click, 1000)
+    pygame.time.set_timer(pygame.QUIT, int(args.probe * 1000), loops=1)
+
+dirty = [window_rect]  # первый кадр рисуется целиком
+running = True
+while running:
+    # Пока перерисовывать нечего, спим в event.wait и не тратим CPU
+    events = pygame.event.get() if dirty else [pygame.event.wait()] + pygame.event.get()
+    for event in events:
+        areas = handle(event)
+        if areas is None:
+            running = False
+            break
+        dirty.extend(areas)
+
+    if running and dirty:
+        frame_started = time.perf_counter()
+        if window_rect in dirty:
+            dirty = [window_rect]  # всё окно покрывает остальные области
+        for area in dirty:
+            draw(area)
+        pygame.display.update(dirty)
+        frame_times.append(time.perf_counter() - frame_started)
+        dirty = []
+        clock.tick(MAX_FPS)  # не чаще MAX_FPS кадров в секунду
+
+if args.probe:
+    elapsed = time.perf_counter() - started
+    print(f'frames: {len(frame_times)} in {elapsed:.1f} s')
+    print(f'frame time p50: {percentile(frame_times, 50) * 1000:.3f} ms, '
+          f'p95: {percentile(frame_times, 95) * 1000:.3f} ms')
+    print(f'cpu: {(time.process_time() - cpu_started) / elapsed:.1%}')
+pygame.quit()